@@ -0,0 +1,98 @@
+"""
+Benchmark of the generated Python matchers against the table-driven CompiledDFA.
+
+Every pattern is matched over a long text with both matchers, and the time to
+build the generated matcher from scratch is compared with loading its cached
+code object. Run it from the project root:
+
+    python -m benchmarks.bench_codegen [text_length]
+"""
+
+import random
+import sys
+import tempfile
+import time
+
+from models.dfa import DFA
+from models.generated_dfa import GeneratedDFA
+from utilities.parser import Parser
+from utilities.tompson import Thompson
+
+PATTERNS = [
+    "(a|b)*abb",
+    "[a-z]+( [a-z]+)*",
+    ".*error.*",
+    '"[^"]*"',
+    "(a|b)*a(a|b)(a|b)(a|b)(a|b)",
+]
+
+
+def text_for(pattern: str, length: int) -> str:
+    """
+    Builds a text that keeps the automata of a pattern alive for most of its length.
+
+    Args:
+        pattern (str): The regular expression.
+        length (int): The length of the text.
+
+    Returns:
+        str: The text.
+    """
+    random.seed(0)
+    if pattern.startswith('"'):
+        return '"' + "x" * (length - 2) + '"'
+    if pattern.startswith(".*"):
+        return "".join(
+            random.choice("abcdefghijklmnopqrstuvwxyz ") for _ in range(length)
+        )
+    if pattern.startswith("[a-z]"):
+        words = ["".join(random.choices("abcdefghij", k=5)) for _ in range(length // 6)]
+        return " ".join(words)
+    return "".join(random.choice("ab") for _ in range(length))
+
+
+def timed(function, *args) -> tuple[object, float]:
+    """
+    Calls a function and measures the seconds it takes.
+
+    Args:
+        function (Callable): The function.
+        *args: Its arguments.
+
+    Returns:
+        tuple[object, float]: The result and the seconds spent.
+    """
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def main(length: int = 1_000_000):
+    print(
+        f"{'pattern':<30} {'table (s)':>10} {'generated (s)':>14} {'speedup':>8} "
+        f"{'build (ms)':>11} {'cached (ms)':>12}"
+    )
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for pattern in PATTERNS:
+            parser = Parser(pattern)
+            nfa = Thompson(parser.alpha).subset_construction(parser.parse().root)
+            table = DFA(parser.alpha, nfa).minimize().compile()
+
+            generated, built = timed(GeneratedDFA.from_regex, pattern, cache_dir)
+            _, loaded = timed(GeneratedDFA.from_regex, pattern, cache_dir)
+
+            text = text_for(pattern, length)
+            expected, table_time = timed(table.match, text)
+            result, generated_time = timed(generated.match, text)
+            assert result == expected, (pattern, result, expected)
+
+            print(
+                f"{pattern:<30} {table_time:>10.3f} {generated_time:>14.3f} "
+                f"{table_time / generated_time:>7.1f}x "
+                f"{built * 1000:>11.1f} {loaded * 1000:>12.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:2]))
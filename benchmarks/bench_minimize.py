@@ -0,0 +1,55 @@
+"""
+Benchmark of the DFA subset construction and Hopcroft minimization.
+
+The pattern (a|b)*a(a|b){k} has a DFA with 2^(k+1) states, so growing k gives
+large DFAs produced by DFA.config. Run it from the project root:
+
+    python -m benchmarks.bench_minimize [max_k]
+"""
+
+import sys
+import time
+
+from models.dfa import DFA
+from utilities.parser import Parser
+from utilities.tompson import Thompson
+
+
+def build(k: int) -> tuple[DFA, float]:
+    """
+    Builds the DFA of (a|b)*a(a|b){k} and times the subset construction.
+
+    Args:
+        k (int): The number of (a|b) after the last forced a.
+
+    Returns:
+        tuple[DFA, float]: The DFA and the seconds spent building it.
+    """
+    parser = Parser("(a|b)*a" + "(a|b)" * k)
+    nfa = Thompson(parser.alpha).subset_construction(parser.parse().root)
+
+    start = time.perf_counter()
+    dfa = DFA(parser.alpha, nfa)
+    return dfa, time.perf_counter() - start
+
+
+def main(max_k: int = 14):
+    print(
+        f"{'k':>3} {'states':>8} {'config (s)':>11} {'minimal':>8} {'minimize (s)':>13}"
+    )
+
+    for k in range(4, max_k + 1):
+        dfa, built = build(k)
+
+        start = time.perf_counter()
+        minimal = dfa.minimize()
+        minimized = time.perf_counter() - start
+
+        print(
+            f"{k:>3} {len(dfa.states):>8} {built:>11.3f} "
+            f"{len(minimal.states):>8} {minimized:>13.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:2]))
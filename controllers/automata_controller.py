@@ -1,9 +1,10 @@
+from interfaces.automata_cache import AutomataCache
 from interfaces.automata_interface import AutomataInterface
 from models.automata import Automata
 from models.dfa import DFA
 from models.nfa import NFA
-from models.tree import Tree
-from utilities.infix_postfix import InfixPostFix
+from utilities.glushkov import Glushkov
+from utilities.parser import Parser
 from utilities.tompson import Thompson
 from views.automata_view import AutomataView
 
@@ -15,9 +16,14 @@ class AutomataController:
     Args:
         model (Automata): The automata model.
         view (AutomataView): The automata view.
+        cache (AutomataCache, optional): The in-memory cache in front of the database.
+        engine (str, optional): The construction used for new automata, "thompson" or "glushkov".
 
     Attributes:
         connection (AutomataInterface): The automata interface for database connection.
+        cache (AutomataCache): The LRU cache of ready to use NFAs and DFAs.
+        engine (str): The construction used for new automata. Both engines accept the
+            same language, so stored automata are reused whichever built them.
         model (Automata): The automata model.
         view (AutomataView): The automata view.
         regex (str): The regular expression.
@@ -26,8 +32,21 @@ class AutomataController:
         dfa (DFA): The DFA object.
     """
 
-    def __init__(self, model: Automata, view: AutomataView) -> None:
+    ENGINES = ("thompson", "glushkov")
+
+    def __init__(
+        self,
+        model: Automata,
+        view: AutomataView,
+        cache: AutomataCache | None = None,
+        engine: str = "thompson",
+    ) -> None:
+        if engine not in self.ENGINES:
+            raise ValueError(f"Unknown engine: {engine}")
+
         self.connection = AutomataInterface()
+        self.cache = cache if cache is not None else AutomataCache()
+        self.engine = engine
         self.model = model
         self.view = view
         self.regex = str(self.view.entry_regex).strip()
@@ -37,7 +56,7 @@ class AutomataController:
 
     def get_automata(self, regex: str):
         """
-        Retrieves the automata from the database or generates a new one based on the given regular expression.
+        Retrieves the automata from the cache, the database or generates a new one based on the given regular expression.
 
         Args:
             regex (str): The regular expression.
@@ -49,14 +68,24 @@ class AutomataController:
             None
         """
         try:
+            cached = self.cache.get(regex)
+            if cached:
+                self.nfa, self.dfa = cached
+                self.regex = regex
+                return
+
             automata = self.connection.select_automata(regex)
             if automata:
-                self.nfa = self.automata.from_hex(automata[0][0])
-                self.dfa = self.automata.from_hex(automata[0][1])
+                hexs = automata[0]
+                self.nfa = self.automata.from_hex(hexs[0])
+                self.dfa = self.automata.from_hex(hexs[1])
             else:
                 self.base_automata(regex)
                 hexs = (self.nfa.to_hex(), self.dfa.to_hex())
                 self.connection.insert_automata((regex, *hexs))
+
+            self.cache.put(regex, (self.nfa, self.dfa), sum(map(len, hexs)) // 2)
+            self.regex = regex
         except Exception as e:
             self.view.open_toplevel(f"Error: {e}")
 
@@ -64,20 +93,31 @@ class AutomataController:
         """
         Generates the base automata based on the given regular expression.
 
+        With the "thompson" engine the DFA is built by subset construction over
+        the Thompson NFA. With the "glushkov" engine the NFA is the epsilon-free
+        position automaton and the DFA is built directly from the followpos sets.
+
         Args:
             regex (str): The regular expression.
 
         Returns:
             None
         """
-        ipt = InfixPostFix(regex)
-        stack = ipt.convert()
+        parser = Parser(regex)
+        tree = parser.parse()
+
+        apha = parser.alpha
+
+        if self.engine == "glushkov":
+            glushkov = Glushkov(apha)
+            self.nfa = glushkov.subset_construction(tree.root).to_nfa()
+            self.dfa = glushkov.dfa().minimize()
+            return
 
-        apha = ipt.stack
-        tree = Tree(stack)
         thompson = Thompson(apha)
-        self.nfa = thompson.subset_construction(tree.root)
-        self.dfa = DFA(apha, self.nfa).minimize()
+        nfa = thompson.subset_construction(tree.root)
+        self.nfa = nfa.to_nfa()
+        self.dfa = DFA(apha, nfa).minimize()
 
     def get_type_automata(self, regex: str, aut_type: str):
         """
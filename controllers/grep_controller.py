@@ -0,0 +1,199 @@
+import mmap
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from models.compiled_dfa import CompiledDFA
+from models.dfa import DFA
+from utilities.literals import Literals
+from utilities.parser import Parser
+from utilities.tompson import Thompson
+
+# The automaton and required literals of the worker processes, installed once by _init_worker.
+_automaton: CompiledDFA | None = None
+_required: frozenset[str] = frozenset()
+
+
+def _init_worker(automaton: CompiledDFA, required: frozenset[str]):
+    """
+    Installs the compiled automaton in a worker process.
+
+    Args:
+        automaton (CompiledDFA): The automaton of the pattern.
+        required (frozenset[str]): The literals of which every match contains one.
+    """
+    global _automaton, _required
+    _automaton = automaton
+    _required = required
+
+
+def _scan_chunk(task: tuple[str, int, int]) -> tuple[int, list[tuple[int, bytes]]]:
+    """
+    Scans a chunk of whole lines of a file.
+
+    The bytes are decoded as UTF-8 with surrogate escapes, so undecodable bytes
+    still match the wildcard and the matching lines are written back unchanged.
+    Lines without any of the required literals are skipped without running the
+    automaton.
+
+    Args:
+        task (tuple[str, int, int]): The path of the file and the byte range of the chunk.
+
+    Returns:
+        tuple[int, list[tuple[int, bytes]]]: The number of lines in the chunk, and
+        the index in the chunk and bytes of every matching line.
+    """
+    path, start, end = task
+
+    with open(path, "rb") as file, mmap.mmap(
+        file.fileno(), 0, access=mmap.ACCESS_READ
+    ) as data:
+        text = data[start:end].decode("utf-8", "surrogateescape")
+
+    lines = text.split("\n")
+    if text.endswith("\n"):
+        lines.pop()
+
+    matches = [
+        (i, line.encode("utf-8", "surrogateescape"))
+        for i, line in enumerate(lines)
+        if (not _required or any(literal in line for literal in _required))
+        and _automaton.fullmatch(line)
+    ]
+    return len(lines), matches
+
+
+class GrepController:
+    """
+    Controller for the grep command, which prints the lines of files that contain a match.
+
+    The pattern is compiled once as the DFA of .*(pattern).*, so a line matches
+    when the DFA accepts it whole. The compiled DFA is sent once to every worker
+    of a process pool. The files are split with mmap into chunks of whole
+    lines, so no match crosses a chunk boundary, and the results are written
+    in the original order of the files and lines. The literals that every match
+    must contain are sent along, so lines without them are rejected with a
+    substring search.
+
+    Args:
+        pattern (str): The regular expression.
+        jobs (int, optional): The number of worker processes. Defaults to the number of CPUs.
+        chunk_size (int, optional): The approximate size of the chunks, in bytes. Defaults to 4 MiB.
+
+    Raises:
+        RegexSyntaxError: If the pattern is not a valid regular expression.
+
+    Attributes:
+        automaton (CompiledDFA): The compiled automaton of the pattern.
+        required (frozenset[str]): The literals of which every match contains one.
+    """
+
+    def __init__(
+        self, pattern: str, jobs: int | None = None, chunk_size: int = 4 * 1024 * 1024
+    ) -> None:
+        self.pattern = pattern
+        self.jobs = jobs or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+
+        # Parsed alone first, so errors point at positions of the given pattern.
+        self.required = Literals.from_tree(Parser(pattern).parse()).required
+
+        parser = Parser(f".*({pattern}).*")
+        nfa = Thompson(parser.alpha).subset_construction(parser.parse().root)
+        self.automaton = DFA(parser.alpha, nfa).minimize().compile()
+
+    def chunks(self, path: str) -> list[tuple[str, int, int]]:
+        """
+        Splits a file into chunks that end at a line break.
+
+        Args:
+            path (str): The path of the file.
+
+        Returns:
+            list[tuple[str, int, int]]: The path and byte range of every chunk.
+        """
+        size = os.path.getsize(path)
+        if size == 0:
+            return []
+
+        tasks = []
+        with open(path, "rb") as file, mmap.mmap(
+            file.fileno(), 0, access=mmap.ACCESS_READ
+        ) as data:
+            start = 0
+            while start < size:
+                end = data.find(b"\n", min(start + self.chunk_size, size) - 1)
+                end = size if end < 0 else end + 1
+                tasks.append((path, start, end))
+                start = end
+
+        return tasks
+
+    def run(
+        self, paths: list[str], line_numbers: bool = False, count: bool = False
+    ) -> int:
+        """
+        Prints the matching lines of the files.
+
+        Lines are prefixed with the path of their file when there are several
+        files, and with their line number if asked. Files that cannot be read
+        are reported on stderr and left out of the counts.
+
+        Args:
+            paths (list[str]): The paths of the files.
+            line_numbers (bool, optional): Whether to print line numbers. Defaults to False.
+            count (bool, optional): Whether to print only the number of matching lines per file. Defaults to False.
+
+        Returns:
+            int: 0 if some line matched, 1 if none did, 2 if a file could not be read.
+        """
+        out = sys.stdout.buffer
+        status = 1
+        tasks = []
+        owners = []
+        readable = []
+
+        # Keyed by the index of the argument, so a file given twice is scanned twice.
+        for index, path in enumerate(paths):
+            try:
+                chunks = self.chunks(path)
+                tasks.extend(chunks)
+                owners.extend([index] * len(chunks))
+                readable.append(index)
+            except OSError as e:
+                print(f"grep: {path}: {e.strerror}", file=sys.stderr)
+                status = 2
+
+        totals = dict.fromkeys(readable, 0)
+        lines = dict.fromkeys(readable, 0)
+
+        with ProcessPoolExecutor(
+            self.jobs,
+            initializer=_init_worker,
+            initargs=(self.automaton, self.required),
+        ) as executor:
+            for index, (path, _, _), (n_lines, matches) in zip(
+                owners, tasks, executor.map(_scan_chunk, tasks)
+            ):
+                prefix = f"{path}:".encode() if len(paths) > 1 else b""
+
+                for i, line in matches:
+                    if not count:
+                        number = (
+                            f"{lines[index] + i + 1}:".encode() if line_numbers else b""
+                        )
+                        out.write(prefix + number + line + b"\n")
+
+                lines[index] += n_lines
+                totals[index] += len(matches)
+
+        if count:
+            for index, total in totals.items():
+                prefix = f"{paths[index]}:" if len(paths) > 1 else ""
+                out.write(f"{prefix}{total}\n".encode())
+
+        out.flush()
+
+        if status == 2:
+            return status
+        return 0 if any(totals.values()) else 1
@@ -0,0 +1,105 @@
+from collections import OrderedDict
+
+
+class AutomataCache:
+    """
+    In-memory LRU cache of ready to use automata, kept in front of AutomataInterface.
+
+    Entries are keyed by the regex text. The cache is bounded both by the number
+    of entries and by the total size of the entries; the least recently used
+    entries are evicted when a bound is exceeded.
+
+    Args:
+        max_entries (int): The maximum number of cached regexes.
+        max_bytes (int): The maximum total size of the cached entries.
+
+    Attributes:
+        hits (int): The number of lookups answered by the cache.
+        misses (int): The number of lookups not found in the cache.
+        evictions (int): The number of entries dropped to honor the bounds.
+        size (int): The total size of the cached entries.
+    """
+
+    def __init__(self, max_entries: int = 256, max_bytes: int = 64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        self._entries: OrderedDict[str, tuple[object, int]] = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, regex: str) -> bool:
+        return regex in self._entries
+
+    def get(self, regex: str):
+        """
+        Returns the cached value of a regex and marks it as recently used.
+
+        Args:
+            regex (str): The regular expression.
+
+        Returns:
+            The cached value, or None if the regex is not cached.
+        """
+        entry = self._entries.get(regex)
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._entries.move_to_end(regex)
+        return entry[0]
+
+    def put(self, regex: str, value, size: int):
+        """
+        Caches the value of a regex, evicting the least recently used entries if needed.
+
+        Values larger than the byte bound are not cached.
+
+        Args:
+            regex (str): The regular expression.
+            value: The value to cache.
+            size (int): The size of the value, in bytes.
+        """
+        old = self._entries.pop(regex, None)
+        if old is not None:
+            self.size -= old[1]
+
+        if size > self.max_bytes:
+            return
+
+        self._entries[regex] = (value, size)
+        self.size += size
+
+        while len(self._entries) > self.max_entries or self.size > self.max_bytes:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self.size -= evicted
+            self.evictions += 1
+
+    def clear(self):
+        """
+        Drops every cached entry. The counters are kept.
+        """
+        self._entries.clear()
+        self.size = 0
+
+    def stats(self) -> dict:
+        """
+        Returns the counters of the cache.
+
+        Returns:
+            dict: The hits, misses, evictions, number of entries and total size.
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "bytes": self.size,
+        }
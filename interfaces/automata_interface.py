@@ -1,6 +1,17 @@
+import os
 import sqlite3
 from sqlite3 import Error
 
+# Bumped whenever the grammar changes the meaning of a regex, so the automata
+# stored by older versions are dropped instead of loaded.
+GRAMMAR_VERSION = 2
+
+# The directory of the SQLite store, at the root of the project whatever the
+# working directory is.
+DATABASE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "database"
+)
+
 
 class AutomataInterface:
     _instance = None
@@ -19,25 +30,30 @@ class AutomataInterface:
         :return: Connection object or None
         """
         try:
-            self.conn = sqlite3.connect("database/automata.db")
+            self.conn = sqlite3.connect(os.path.join(DATABASE_DIR, "automata.db"))
             self.create_table()
         except Error as e:
             print(e)
 
     def create_table(self):
         """create a table from the create_table_sql statement
+        and drop its rows if they were stored by another grammar version
         :param conn: Connection object
         :param create_table_sql: a CREATE TABLE statement
         :return:
         """
         try:
             cur = self.conn.cursor()
-            cur.execute(
-                """CREATE TABLE IF NOT EXISTS automata(
+            cur.execute("""CREATE TABLE IF NOT EXISTS automata(
             regex TEXT NOT NULL PRIMARY KEY,
             nfa TEXT NOT NULL,
-            dfa TEXT NOT NULL)"""
-            )
+            dfa TEXT NOT NULL)""")
+
+            cur.execute("PRAGMA user_version")
+            if cur.fetchone()[0] != GRAMMAR_VERSION:
+                cur.execute("DELETE FROM automata")
+                cur.execute(f"PRAGMA user_version = {GRAMMAR_VERSION}")
+                self.conn.commit()
 
         except Error as e:
             print(e)
@@ -0,0 +1,348 @@
+import asyncio
+import json
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+
+from models.compiled_dfa import CompiledDFA
+from models.dfa import DFA
+from utilities.histogram import LatencyHistogram
+from utilities.parser import Parser
+from utilities.tompson import Thompson
+
+
+def _compile(regex: str) -> CompiledDFA:
+    """
+    Builds the compiled minimal DFA of a regular expression.
+
+    Args:
+        regex (str): The regular expression.
+
+    Raises:
+        RegexSyntaxError: If the regular expression is not valid.
+
+    Returns:
+        CompiledDFA: The compiled automaton.
+    """
+    parser = Parser(regex)
+    nfa = Thompson(parser.alpha).subset_construction(parser.parse().root)
+    return DFA(parser.alpha, nfa).minimize().compile()
+
+
+class AutomataService:
+    """
+    Long-lived service that compiles regular expressions and matches strings over a local socket.
+
+    Clients send one JSON object per line and receive one JSON object per line.
+    Every request may carry an "id", which is echoed in its response; responses
+    of one connection are written as soon as they are ready, so they may come
+    out of order. The operations are:
+
+        {"op": "compile", "regex": "(a|b)*abb"}
+            -> {"ok": true, "pattern": 0, "states": 4}
+        {"op": "match", "pattern": 0, "text": "abb"}
+            -> {"ok": true, "match": true}
+        {"op": "match_many", "pattern": 0, "texts": ["abb", "ab"]}
+            -> {"ok": true, "matches": [true, false]}
+        {"op": "stats"}
+            -> {"ok": true, "latency": {...}, "batches": {...}}
+
+    Failed requests get {"ok": false, "error": "..."}.
+
+    Builds run in a process pool, so the event loop keeps serving matches while
+    large automata are built, and concurrent compiles of the same regular
+    expression share one build. Match requests for the same pattern that arrive
+    within batch_delay seconds are grouped and answered with one match_many
+    call, up to max_batch strings per batch.
+
+    The regular expressions are parsed in the event loop before the build, which
+    is linear in their length, so syntax errors are reported directly.
+
+    Args:
+        executor (Executor, optional): The executor of the builds. Defaults to a process pool.
+        batch_delay (float, optional): The seconds a match waits for others to join its batch. Defaults to 0.0005.
+        max_batch (int, optional): The largest batch. Defaults to 1024.
+
+    Attributes:
+        patterns (list[CompiledDFA]): The compiled automata, indexed by pattern id.
+        latency (dict[str, LatencyHistogram]): The latency of the requests, by operation.
+        batches (int): The number of match batches.
+        batched (int): The number of matches answered in batches.
+        largest_batch (int): The size of the largest match batch.
+    """
+
+    OPERATIONS = ("compile", "match", "match_many", "stats")
+
+    def __init__(
+        self,
+        executor: Executor | None = None,
+        batch_delay: float = 0.0005,
+        max_batch: int = 1024,
+    ):
+        self.executor = executor or ProcessPoolExecutor(os.cpu_count() or 1)
+        self.batch_delay = batch_delay
+        self.max_batch = max_batch
+
+        self.patterns: list[CompiledDFA] = []
+        self._ids: dict[str, int] = {}
+        self._building: dict[str, asyncio.Future] = {}
+        self._pending: dict[int, list[tuple[str, asyncio.Future]]] = {}
+        self._timers: dict[int, asyncio.TimerHandle] = {}
+
+        self.latency = {op: LatencyHistogram() for op in self.OPERATIONS}
+        self.batches = 0
+        self.batched = 0
+        self.largest_batch = 0
+
+    async def compile(self, regex: str) -> int:
+        """
+        Compiles a regular expression, reusing a previous build of the same one.
+
+        Args:
+            regex (str): The regular expression.
+
+        Raises:
+            RegexSyntaxError: If the regular expression is not valid.
+
+        Returns:
+            int: The id of the compiled pattern.
+        """
+        if regex in self._ids:
+            return self._ids[regex]
+
+        building = self._building.get(regex)
+        if building is None:
+            Parser(regex).parse()
+            loop = asyncio.get_running_loop()
+            building = loop.run_in_executor(self.executor, _compile, regex)
+            self._building[regex] = building
+
+        try:
+            automaton = await building
+        finally:
+            self._building.pop(regex, None)
+
+        if regex not in self._ids:
+            self._ids[regex] = len(self.patterns)
+            self.patterns.append(automaton)
+
+        return self._ids[regex]
+
+    def _automaton(self, pattern) -> CompiledDFA:
+        """
+        Returns the automaton of a pattern id.
+
+        Args:
+            pattern: The pattern id sent by the client.
+
+        Raises:
+            ValueError: If there is no pattern with that id.
+
+        Returns:
+            CompiledDFA: The compiled automaton.
+        """
+        if not isinstance(pattern, int) or not 0 <= pattern < len(self.patterns):
+            raise ValueError(f"Unknown pattern: {pattern!r}")
+        return self.patterns[pattern]
+
+    def _flush(self, pattern: int):
+        """
+        Answers the pending matches of a pattern with one batch.
+
+        The timer of the batch is cancelled, so it cannot flush the next
+        batch early. If the batch fails, every pending match gets the error.
+
+        Args:
+            pattern (int): The pattern id.
+        """
+        timer = self._timers.pop(pattern, None)
+        if timer is not None:
+            timer.cancel()
+
+        pending = self._pending.pop(pattern, [])
+        if not pending:
+            return
+
+        self.batches += 1
+        self.batched += len(pending)
+        self.largest_batch = max(self.largest_batch, len(pending))
+
+        # Runs in a loop callback, so errors go to the futures or no one sees them.
+        try:
+            matches = self.patterns[pattern].match_many([text for text, _ in pending])
+        except Exception as e:
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), match in zip(pending, matches):
+            if not future.done():
+                future.set_result(bool(match))
+
+    async def match(self, pattern: int, text: str) -> bool:
+        """
+        Matches a string, in a batch with the other strings of the same pattern.
+
+        Args:
+            pattern (int): The pattern id.
+            text (str): The string to match.
+
+        Raises:
+            ValueError: If there is no pattern with that id.
+            TypeError: If the text is not a string.
+
+        Returns:
+            bool: True if the pattern accepts the whole string, False otherwise.
+        """
+        self._automaton(pattern)
+        if not isinstance(text, str):
+            raise TypeError("The text must be a string")
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        pending = self._pending.setdefault(pattern, [])
+        pending.append((text, future))
+
+        if len(pending) == 1:
+            self._timers[pattern] = loop.call_later(
+                self.batch_delay, self._flush, pattern
+            )
+        elif len(pending) >= self.max_batch:
+            self._flush(pattern)
+
+        return await future
+
+    async def handle(self, request: dict) -> dict:
+        """
+        Answers a request.
+
+        Args:
+            request (dict): The decoded request.
+
+        Raises:
+            ValueError: If the request is not valid.
+            KeyError: If a field of the request is missing.
+            TypeError: If a field of the request has the wrong type.
+            RegexSyntaxError: If a compiled regular expression is not valid.
+
+        Returns:
+            dict: The fields of the response.
+        """
+        op = request.get("op")
+
+        if op == "compile":
+            pattern = await self.compile(request["regex"])
+            return {"pattern": pattern, "states": self.patterns[pattern].n_states - 1}
+
+        if op == "match":
+            return {"match": await self.match(request["pattern"], request["text"])}
+
+        if op == "match_many":
+            automaton = self._automaton(request["pattern"])
+            texts = request["texts"]
+            if not isinstance(texts, list) or not all(
+                isinstance(t, str) for t in texts
+            ):
+                raise TypeError("The texts must be a list of strings")
+
+            matches = automaton.match_many(texts)
+            return {"matches": [bool(m) for m in matches]}
+
+        if op == "stats":
+            return {
+                "patterns": len(self.patterns),
+                "latency": {op: h.json() for op, h in self.latency.items()},
+                "batches": {
+                    "count": self.batches,
+                    "mean_size": self.batched / self.batches if self.batches else 0.0,
+                    "max_size": self.largest_batch,
+                },
+            }
+
+        raise ValueError(f"Unknown operation: {op!r}")
+
+    async def _respond(self, line: bytes, writer: asyncio.StreamWriter):
+        """
+        Answers one line of a connection and writes the response.
+
+        Args:
+            line (bytes): The JSON request.
+            writer (asyncio.StreamWriter): The writer of the connection.
+        """
+        start = time.perf_counter()
+        response = {}
+        op = None
+
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("The request must be a JSON object")
+
+            op = request.get("op")
+            if "id" in request:
+                response["id"] = request["id"]
+
+            response.update(await self.handle(request))
+            response["ok"] = True
+
+        except KeyError as e:
+            response["ok"] = False
+            response["error"] = f"Missing field: {e}"
+
+        except Exception as e:
+            response["ok"] = False
+            response["error"] = str(e)
+
+        if op in self.latency:
+            self.latency[op].record(time.perf_counter() - start)
+
+        writer.write(json.dumps(response).encode() + b"\n")
+
+    async def serve_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ):
+        """
+        Serves a connection until the client closes it.
+
+        Args:
+            reader (asyncio.StreamReader): The reader of the connection.
+            writer (asyncio.StreamWriter): The writer of the connection.
+        """
+        tasks = set()
+
+        try:
+            while line := await reader.readline():
+                if line.strip():
+                    task = asyncio.create_task(self._respond(line, writer))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+
+                await writer.drain()
+
+            if tasks:
+                await asyncio.gather(*tasks)
+            await writer.drain()
+
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+            pass
+
+        finally:
+            writer.close()
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 8765):
+        """
+        Serves clients until cancelled.
+
+        Args:
+            host (str, optional): The address to listen on. Defaults to "127.0.0.1".
+            port (int, optional): The port to listen on. Defaults to 8765.
+        """
+        server = await asyncio.start_server(
+            self.serve_client, host, port, limit=64 * 1024 * 1024
+        )
+
+        with self.executor:
+            async with server:
+                await server.serve_forever()
@@ -1,10 +1,108 @@
-from views.app import App
+import argparse
+import sys
 
 
-def main() -> None:
+def grep(args: argparse.Namespace) -> int:
+    """
+    Runs the headless grep command.
+
+    Args:
+        args (argparse.Namespace): The parsed command-line arguments.
+
+    Returns:
+        int: The exit status of the command.
+    """
+    from controllers.grep_controller import GrepController
+    from utilities.parser import RegexSyntaxError
+
+    try:
+        controller = GrepController(args.pattern, args.jobs)
+    except RegexSyntaxError as e:
+        print(f"grep: Invalid regex: {e}", file=sys.stderr)
+        return 2
+
+    return controller.run(args.files, args.line_number, args.count)
+
+
+def serve(args: argparse.Namespace) -> int:
+    """
+    Runs the compile-and-match service until interrupted.
+
+    Args:
+        args (argparse.Namespace): The parsed command-line arguments.
+
+    Returns:
+        int: The exit status of the command.
+    """
+    import asyncio
+    from concurrent.futures import ProcessPoolExecutor
+
+    from interfaces.automata_service import AutomataService
+
+    service = AutomataService(ProcessPoolExecutor(args.jobs))
+    print(f"Serving on {args.host}:{args.port}", file=sys.stderr)
+
+    try:
+        asyncio.run(service.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+    return 0
+
+
+def main(argv: list[str] | None = None) -> None:
     """
     Entry point of the program.
+
+    Without a command the graphical application is opened.
+
+    Args:
+        argv (list[str], optional): The command-line arguments. Defaults to sys.argv.
     """
+    parser = argparse.ArgumentParser(description="Regex to NFA and DFA tool.")
+    commands = parser.add_subparsers(dest="command")
+
+    grep_parser = commands.add_parser(
+        "grep", help="Print the lines of files that contain a match of a pattern."
+    )
+    grep_parser.add_argument("pattern", help="The regular expression.")
+    grep_parser.add_argument("files", nargs="+", help="The files to scan.")
+    grep_parser.add_argument(
+        "-n", "--line-number", action="store_true", help="Print line numbers."
+    )
+    grep_parser.add_argument(
+        "-c",
+        "--count",
+        action="store_true",
+        help="Print only the counts of matching lines.",
+    )
+    grep_parser.add_argument(
+        "-j", "--jobs", type=int, default=None, help="The number of worker processes."
+    )
+
+    serve_parser = commands.add_parser(
+        "serve", help="Serve JSON compile and match requests over a local socket."
+    )
+    serve_parser.add_argument(
+        "--host", default="127.0.0.1", help="The address to listen on."
+    )
+    serve_parser.add_argument(
+        "--port", type=int, default=8765, help="The port to listen on."
+    )
+    serve_parser.add_argument(
+        "-j", "--jobs", type=int, default=None, help="The number of build processes."
+    )
+
+    args = parser.parse_args(argv)
+
+    if args.command == "grep":
+        sys.exit(grep(args))
+
+    if args.command == "serve":
+        sys.exit(serve(args))
+
+    from views.app import App
+
     try:
         App().mainloop()
 
@@ -155,7 +155,7 @@ class Automata(ABC):
 
             for t in self.trans:
                 automata.edge(
-                    f"{t.origin.id}", f"{t.destiny.id}", label=f"{t.symbol.value}"
+                    f"{t.origin.id}", f"{t.destiny.id}", label=t.symbol.display()
                 )
 
             automata.render(f"/tmp/automata_{hash(self)}", format="png", view=False)
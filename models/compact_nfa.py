@@ -0,0 +1,529 @@
+from array import array
+
+from models.nfa import NFA
+from utilities.bitset import from_bits, iter_bits
+from utilities.sparse_set import SparseSet
+from utilities.state import State, Type
+from utilities.symbol import EPSILON, Symbol
+from utilities.transition import Transition
+
+
+class CompactNFA:
+    """
+    Represents a Non-Deterministic Finite Automaton with dense integer states.
+
+    The states are the integers 0..n_states-1. The outgoing edges of every state
+    are stored in compressed sparse row form: the edges of state s are the
+    entries index[s]..index[s + 1] of the edge arrays. Epsilon edges and symbol
+    edges are kept in separate rows, and all of them live in array buffers.
+
+    Args:
+        alpha (dict[int, Symbol]): The alphabet of the NFA.
+        symbols (list[Symbol]): The labels of the symbol edges, indexed by label id.
+        n_states (int): The number of states.
+        i_state (int): The initial state.
+        f_states (int | list[int]): The final state, or the list of final states.
+        eps_edges (tuple[array, array]): The origins and destinies of the epsilon edges.
+        sym_edges (tuple[array, array, array]): The origins, label ids and destinies of the symbol edges.
+        tags (dict[int, int], optional): The slot recorded by the epsilon edges of every tagged state.
+
+    Attributes:
+        eps_index (array): The row offsets of the epsilon edges.
+        eps_targets (array): The destinies of the epsilon edges.
+        sym_index (array): The row offsets of the symbol edges.
+        sym_labels (array): The label ids of the symbol edges.
+        sym_targets (array): The destinies of the symbol edges.
+        f_mask (int): The bitset of the final states.
+        n_groups (int): The number of capture groups tagged in the automaton.
+    """
+
+    def __init__(
+        self,
+        alpha: dict[int, Symbol],
+        symbols: list[Symbol],
+        n_states: int,
+        i_state: int,
+        f_states: int | list[int],
+        eps_edges: tuple[array, array],
+        sym_edges: tuple[array, array, array],
+        tags: dict[int, int] | None = None,
+    ):
+        self.alpha = alpha
+        self.symbols = symbols
+        self.n_states = n_states
+        self.i_state = i_state
+        self.f_states = isinstance(f_states, int) and [f_states] or list(f_states)
+
+        self.eps_index, (self.eps_targets,) = self._rows(eps_edges[0], eps_edges[1:])
+        self.sym_index, (self.sym_labels, self.sym_targets) = self._rows(
+            sym_edges[0], sym_edges[1:]
+        )
+
+        self.f_mask = sum(1 << f for f in set(self.f_states))
+        self._closures: dict[int, tuple[int, ...]] = {}
+        self._visited = SparseSet(n_states)
+
+        self.tags = dict(tags or {})
+        self.n_groups = max(self.tags.values(), default=1) // 2
+
+    @property
+    def f_state(self) -> int:
+        """
+        Returns the first final state of the NFA.
+
+        Returns:
+            int: The first final state.
+        """
+        return self.f_states[0]
+
+    def _rows(self, origins: array, columns: tuple[array, ...]):
+        """
+        Groups edge columns by origin with a counting sort.
+
+        Args:
+            origins (array): The origin of every edge.
+            columns (tuple[array, ...]): The other columns of the edges.
+
+        Returns:
+            tuple[array, tuple[array, ...]]: The row offsets and the grouped columns.
+        """
+        index = array("i", [0]) * (self.n_states + 1)
+        for o in origins:
+            index[o + 1] += 1
+
+        for s in range(self.n_states):
+            index[s + 1] += index[s]
+
+        rows = tuple(array("i", [0]) * len(origins) for _ in columns)
+        fill = index[:-1]
+
+        for k, o in enumerate(origins):
+            p = fill[o]
+            fill[o] = p + 1
+            for row, column in zip(rows, columns):
+                row[p] = column[k]
+
+        return index, rows
+
+    def state_closure(self, state: int) -> tuple[int, ...]:
+        """
+        Returns the epsilon closure of a state.
+
+        The closures of states with epsilon edges are remembered once computed;
+        every other state is its own closure and costs no memory.
+
+        Args:
+            state (int): The state.
+
+        Returns:
+            tuple[int, ...]: The members of the closure, in increasing order.
+        """
+        if self.eps_index[state] == self.eps_index[state + 1]:
+            return (state,)
+
+        members = self._closures.get(state)
+        if members is None:
+            members = self._closures[state] = self.closure_members((state,))
+        return members
+
+    def closure_members(self, states) -> tuple[int, ...]:
+        """
+        Computes the epsilon closure of a set of states as its sorted members.
+
+        The epsilon edges are walked from the states, with a sparse set of the
+        visited states that is reused by every call, so the cost follows the
+        size of the closure and not the number of NFA states.
+
+        Args:
+            states (Iterable[int]): The states.
+
+        Returns:
+            tuple[int, ...]: The states of the closure, in increasing order.
+        """
+        eps_index, eps_targets = self.eps_index, self.eps_targets
+        visited = self._visited
+        visited.clear()
+        pending = list(states)
+
+        while pending:
+            s = pending.pop()
+            if visited.add(s):
+                pending.extend(eps_targets[eps_index[s] : eps_index[s + 1]])
+
+        return tuple(sorted(visited))
+
+    def closure(self, states: int) -> int:
+        """
+        Computes the epsilon closure of a set of states.
+
+        Args:
+            states (int): The bitset of the states.
+
+        Returns:
+            int: The bitset of the closure, the union of the closures of the states.
+        """
+        return from_bits(self.closure_members(iter_bits(states)))
+
+    def epsilon(self, state: int) -> array:
+        """
+        Returns the destinies of the epsilon edges of a state.
+
+        Args:
+            state (int): The state.
+
+        Returns:
+            array: The destinies of the epsilon edges.
+        """
+        return self.eps_targets[self.eps_index[state] : self.eps_index[state + 1]]
+
+    def edges(self, state: int):
+        """
+        Returns the symbol edges of a state.
+
+        Args:
+            state (int): The state.
+
+        Returns:
+            Iterator[tuple[Symbol, int]]: The symbol and destiny of every edge.
+        """
+        for k in range(self.sym_index[state], self.sym_index[state + 1]):
+            yield self.symbols[self.sym_labels[k]], self.sym_targets[k]
+
+    def match(self, text: str, pos: int = 0) -> tuple[int, int] | None:
+        """
+        Matches the automaton at a position of a text.
+
+        Args:
+            text (str): The text to match.
+            pos (int, optional): The position where the match must start. Defaults to 0.
+
+        Returns:
+            tuple[int, int] | None: The span of the longest match starting at pos, or None.
+        """
+        return self._simulate(text, pos, True)
+
+    def fullmatch(self, text: str) -> bool:
+        """
+        Checks if the automaton accepts the whole text.
+
+        Args:
+            text (str): The text to check.
+
+        Returns:
+            bool: True if the text is in the language of the automaton, False otherwise.
+        """
+        span = self._simulate(text, 0, True)
+        return span is not None and span[1] == len(text)
+
+    def search(self, text: str, pos: int = 0) -> tuple[int, int] | None:
+        """
+        Finds the leftmost-longest match of the automaton in a text.
+
+        Args:
+            text (str): The text to search.
+            pos (int, optional): The position where the search starts. Defaults to 0.
+
+        Returns:
+            tuple[int, int] | None: The span of the match, or None if there is none.
+        """
+        return self._simulate(text, pos, False)
+
+    def _follow(self, states: SparseSet, starts: list[int], state: int, start: int):
+        """
+        Adds a state and its epsilon closure to a set of active states.
+
+        States already in the set are skipped: they were added by a thread with
+        an earlier or equal start, which has priority.
+
+        Args:
+            states (SparseSet): The active states.
+            starts (list[int]): The start position of the thread of every active state.
+            state (int): The state to add.
+            start (int): The start position of the thread.
+        """
+        eps_index, eps_targets = self.eps_index, self.eps_targets
+        pending = [state]
+
+        while pending:
+            s = pending.pop()
+            if not states.add(s):
+                continue
+
+            starts[s] = start
+            for k in range(eps_index[s + 1] - 1, eps_index[s] - 1, -1):
+                pending.append(eps_targets[k])
+
+    def _simulate(self, text: str, pos: int, anchored: bool) -> tuple[int, int] | None:
+        """
+        Runs the automaton over a text, one step per character.
+
+        The active states are kept in a sparse set ordered by the start of their
+        thread. Once a match is found no new threads are started and the threads
+        that started later are dropped, so the run stops as soon as no thread
+        can improve the match.
+
+        Args:
+            text (str): The text to run over.
+            pos (int): The position where the run starts.
+            anchored (bool): Whether matches must start at pos.
+
+        Returns:
+            tuple[int, int] | None: The span of the leftmost-longest match, or None.
+        """
+        symbols = self.symbols
+        sym_index, sym_labels, sym_targets = (
+            self.sym_index,
+            self.sym_labels,
+            self.sym_targets,
+        )
+        finals = set(self.f_states)
+
+        current, following = SparseSet(self.n_states), SparseSet(self.n_states)
+        starts, next_starts = [0] * self.n_states, [0] * self.n_states
+        best: tuple[int, int] | None = None
+
+        for i in range(pos, len(text) + 1):
+            if best is None and (not anchored or i == pos):
+                self._follow(current, starts, self.i_state, i)
+
+            if not current:
+                if anchored or best is not None:
+                    break
+                continue
+
+            for s in current:
+                if s in finals:
+                    start = starts[s]
+                    if best is None or start <= best[0]:
+                        best = (start, i)
+
+            if i == len(text):
+                break
+
+            code = ord(text[i])
+            following.clear()
+
+            for s in current:
+                start = starts[s]
+                if best is not None and start > best[0]:
+                    continue
+
+                for k in range(sym_index[s], sym_index[s + 1]):
+                    if symbols[sym_labels[k]].contains(code):
+                        self._follow(following, next_starts, sym_targets[k], start)
+
+            current, following = following, current
+            starts, next_starts = next_starts, starts
+
+        return best
+
+    def match_groups(
+        self, text: str, pos: int = 0
+    ) -> list[tuple[int, int] | None] | None:
+        """
+        Matches the automaton at a position of a text and extracts its capture groups.
+
+        Args:
+            text (str): The text to match.
+            pos (int, optional): The position where the match must start. Defaults to 0.
+
+        Returns:
+            list[tuple[int, int] | None] | None: The span of the longest match starting
+            at pos followed by the span of every group, None for the groups that did
+            not take part, or None if there is no match.
+        """
+        return self._simulate_groups(text, pos, True)
+
+    def search_groups(
+        self, text: str, pos: int = 0
+    ) -> list[tuple[int, int] | None] | None:
+        """
+        Finds the leftmost-longest match of the automaton in a text and extracts its capture groups.
+
+        Args:
+            text (str): The text to search.
+            pos (int, optional): The position where the search starts. Defaults to 0.
+
+        Returns:
+            list[tuple[int, int] | None] | None: The span of the match followed by the
+            span of every group, None for the groups that did not take part, or None
+            if there is no match.
+        """
+        return self._simulate_groups(text, pos, False)
+
+    def _follow_tags(
+        self,
+        states: SparseSet,
+        slots: list[list],
+        state: int,
+        thread: list,
+        pos: int,
+    ):
+        """
+        Adds a state and its epsilon closure to a set of active states, recording tags.
+
+        The epsilon edges are followed depth first in the order they were added,
+        so the states reached through preferred edges come first. A tagged state
+        records the position in its slot, in a copy of the slots of the thread.
+
+        Args:
+            states (SparseSet): The active states, in order of priority.
+            slots (list[list]): The slots of the thread of every active state.
+            state (int): The state to add.
+            thread (list): The slots of the thread.
+            pos (int): The current position in the text.
+        """
+        eps_index, eps_targets, tags = self.eps_index, self.eps_targets, self.tags
+        pending = [(state, thread)]
+
+        while pending:
+            s, thread = pending.pop()
+            if not states.add(s):
+                continue
+
+            slot = tags.get(s)
+            if slot is not None:
+                thread = thread.copy()
+                thread[slot] = pos
+
+            slots[s] = thread
+            for k in range(eps_index[s + 1] - 1, eps_index[s] - 1, -1):
+                pending.append((eps_targets[k], thread))
+
+    def _simulate_groups(
+        self, text: str, pos: int, anchored: bool
+    ) -> list[tuple[int, int] | None] | None:
+        """
+        Runs the automaton over a text like _simulate, carrying the capture slots of every thread.
+
+        This is a Pike VM: every active state holds a single thread, the one with
+        the highest priority, so a run takes O(n * m) steps for a text of length
+        n and an automaton of m states, each copying at most the slots of the
+        groups. The threads are ordered by start and then by the preference of
+        the edges they took. The match is the leftmost-longest one, and its
+        groups come from the preferred thread that reaches it.
+
+        Args:
+            text (str): The text to run over.
+            pos (int): The position where the run starts.
+            anchored (bool): Whether matches must start at pos.
+
+        Returns:
+            list[tuple[int, int] | None] | None: The spans of the match and of its groups, or None.
+        """
+        symbols = self.symbols
+        sym_index, sym_labels, sym_targets = (
+            self.sym_index,
+            self.sym_labels,
+            self.sym_targets,
+        )
+        finals = set(self.f_states)
+        n_slots = 2 * (self.n_groups + 1)
+
+        current, following = SparseSet(self.n_states), SparseSet(self.n_states)
+        slots, next_slots = [None] * self.n_states, [None] * self.n_states
+        best: list | None = None
+
+        for i in range(pos, len(text) + 1):
+            if best is None and (not anchored or i == pos):
+                thread = [None] * n_slots
+                thread[0] = i
+                self._follow_tags(current, slots, self.i_state, thread, i)
+
+            if not current:
+                if anchored or best is not None:
+                    break
+                continue
+
+            # The first final thread has the earliest start and the highest priority.
+            for s in current:
+                if s in finals:
+                    if best is None or slots[s][0] < best[0] or i > best[1]:
+                        best = slots[s].copy()
+                        best[1] = i
+                    break
+
+            if i == len(text):
+                break
+
+            code = ord(text[i])
+            following.clear()
+
+            for s in current:
+                thread = slots[s]
+                if best is not None and thread[0] > best[0]:
+                    continue
+
+                for k in range(sym_index[s], sym_index[s + 1]):
+                    if symbols[sym_labels[k]].contains(code):
+                        self._follow_tags(
+                            following, next_slots, sym_targets[k], thread, i + 1
+                        )
+
+            current, following = following, current
+            slots, next_slots = next_slots, slots
+
+        if best is None:
+            return None
+
+        return [
+            (
+                (best[k], best[k + 1])
+                if best[k] is not None and best[k + 1] is not None
+                else None
+            )
+            for k in range(0, n_slots, 2)
+        ]
+
+    def suffixes(self):
+        """
+        Creates an NFA that accepts every suffix of the strings of this one.
+
+        A new initial state has an epsilon edge to every state, so a run may
+        start anywhere in the automaton. States that the initial state does not
+        reach only add strings, so the language always contains the suffixes.
+
+        Returns:
+            CompactNFA: The new NFA, without tags.
+        """
+        n = self.n_states
+        eps_origins = array("i", [n]) * n
+        eps_targets = array("i", range(n))
+        sym_origins = array("i")
+
+        for s in range(n):
+            eps_origins.extend([s] * (self.eps_index[s + 1] - self.eps_index[s]))
+            sym_origins.extend([s] * (self.sym_index[s + 1] - self.sym_index[s]))
+        eps_targets.extend(self.eps_targets)
+
+        return CompactNFA(
+            self.alpha,
+            self.symbols,
+            n + 1,
+            n,
+            self.f_states,
+            (eps_origins, eps_targets),
+            (sym_origins, self.sym_labels, self.sym_targets),
+        )
+
+    def to_nfa(self) -> NFA:
+        """
+        Converts the automaton to the object graph used for drawing and JSON.
+
+        Returns:
+            NFA: The equivalent NFA made of State and Transition objects.
+        """
+        typ = {self.i_state: Type.INITIAL}
+        typ.update(dict.fromkeys(self.f_states, Type.FINAL))
+        states = [State(s, typ.get(s, Type.TRANS)) for s in range(self.n_states)]
+
+        trans = []
+        for s in range(self.n_states):
+            for d in self.epsilon(s):
+                trans.append(Transition(states[s], EPSILON, states[d]))
+
+            for symbol, d in self.edges(s):
+                trans.append(Transition(states[s], symbol, states[d]))
+
+        f_states = [states[f] for f in self.f_states]
+        return NFA(self.alpha, states, states[self.i_state], f_states, trans)
@@ -0,0 +1,267 @@
+from array import array
+from bisect import bisect_right
+
+from utilities.symbol import Symbol
+
+try:
+    import numpy
+except ImportError:  # NumPy is optional, only match_many uses it.
+    numpy = None
+
+# The scan loop translates the text in blocks that start at SCAN_BLOCK
+# characters and double up to MAX_SCAN_BLOCK, so a run that dies early only
+# translates about as much text as it reads.
+SCAN_BLOCK = 64
+MAX_SCAN_BLOCK = 1 << 16
+
+
+class ClassMap(dict):
+    """
+    Maps code points to the character of their class, for str.translate.
+
+    Entries are computed on first use with a binary search over the ranges of
+    the classes, so translating a text only searches once per distinct character.
+
+    Args:
+        ranges (list[tuple[int, int, int]]): The sorted (low, high, class) ranges.
+        other (int): The class of the code points outside every range.
+    """
+
+    def __init__(self, ranges: list[tuple[int, int, int]], other: int):
+        super().__init__()
+        self._lows = [lo for lo, _, _ in ranges]
+        self._highs = [hi for _, hi, _ in ranges]
+        self._classes = [c for _, _, c in ranges]
+        self._other = other
+
+    def classify(self, code: int) -> int:
+        """
+        Returns the class of a code point.
+
+        Args:
+            code (int): The code point.
+
+        Returns:
+            int: The class of the code point.
+        """
+        i = bisect_right(self._lows, code) - 1
+        if i >= 0 and code <= self._highs[i]:
+            return self._classes[i]
+        return self._other
+
+    def __missing__(self, code: int) -> str:
+        value = self[code] = chr(self.classify(code))
+        return value
+
+
+class CompiledDFA:
+    """
+    Represents a DFA compiled to a dense integer transition table.
+
+    Every alphabet key of the DFA is a character class; one more class holds
+    the characters outside the alphabet. The transitions live in an array where
+    next_state[state * n_classes + c] is the destiny of state on class c. The
+    last state is a dead sink, the destiny of every missing transition.
+
+    The scan loop translates the text to a string of class ids in C with
+    str.translate, in blocks that grow as the run goes on, and walks a
+    premultiplied copy of the table, so every character costs one array lookup.
+
+    Args:
+        alpha (dict[int, Symbol]): The alphabet of the DFA, whose keys are the classes.
+        table (list[dict[int, int]]): For every state, the destiny of each alphabet key.
+        finals (list[bool]): Whether every state is final.
+
+    Attributes:
+        n_states (int): The number of states, including the dead state.
+        n_classes (int): The number of character classes.
+        dead (int): The dead state.
+        next_state (array): The transition table.
+        accepts (bytearray): The accept bitmap; byte s is 1 if state s is final.
+        classes (ClassMap): The map from code points to class characters.
+    """
+
+    def __init__(
+        self,
+        alpha: dict[int, Symbol],
+        table: list[dict[int, int]],
+        finals: list[bool],
+    ):
+        keys = list(alpha)
+        column = {key: c for c, key in enumerate(keys)}
+
+        self.n_states = len(table) + 1
+        self.n_classes = len(keys) + 1
+        self.dead = len(table)
+
+        self.next_state = array("i", [self.dead]) * (self.n_states * self.n_classes)
+        for s, row in enumerate(table):
+            for key, destiny in row.items():
+                self.next_state[s * self.n_classes + column[key]] = destiny
+
+        self.accepts = bytearray(self.n_states)
+        for s, final in enumerate(finals):
+            self.accepts[s] = final
+
+        ranges = sorted(
+            (lo, hi, c) for c, key in enumerate(keys) for lo, hi in alpha[key].ranges
+        )
+        self.classes = ClassMap(ranges, len(keys))
+
+        # The same table with destinies premultiplied by n_classes, and the
+        # accept bitmap indexed by those offsets, for the scan loop.
+        self._jump = array("i", (d * self.n_classes for d in self.next_state))
+        self._accepts = bytearray(len(self._jump))
+        for s in range(self.n_states):
+            self._accepts[s * self.n_classes] = self.accepts[s]
+
+    def translate(self, text: str):
+        """
+        Translates a text to the sequence of its character classes.
+
+        Args:
+            text (str): The text.
+
+        Returns:
+            bytes | list[int]: The class of every character.
+        """
+        translated = text.translate(self.classes)
+
+        if self.n_classes <= 256:
+            return translated.encode("latin-1")
+        return [ord(c) for c in translated]
+
+    def _scan(self, text: str, pos: int) -> int:
+        """
+        Runs the DFA over a text from a position until it dies or the text ends.
+
+        Args:
+            text (str): The text to run over.
+            pos (int): The position where the run starts.
+
+        Returns:
+            int: The end of the longest accepted prefix, or -1 if there is none.
+        """
+        jump, accepts = self._jump, self._accepts
+        dead = self.dead * self.n_classes
+
+        state = 0
+        best = pos if accepts[0] else -1
+        size = SCAN_BLOCK
+
+        while pos < len(text):
+            block = text[pos : pos + size]
+
+            for i, c in enumerate(self.translate(block), pos + 1):
+                state = jump[state + c]
+                if state == dead:
+                    return best
+                if accepts[state]:
+                    best = i
+
+            pos += len(block)
+            size = min(2 * size, MAX_SCAN_BLOCK)
+
+        return best
+
+    def run(self, text: str) -> int:
+        """
+        Runs the DFA over a whole text.
+
+        Args:
+            text (str): The text to run over.
+
+        Returns:
+            int: The state reached at the end of the text, or the dead state.
+        """
+        jump = self._jump
+        dead = self.dead * self.n_classes
+        state = 0
+
+        for c in self.translate(text):
+            state = jump[state + c]
+            if state == dead:
+                break
+
+        return state // self.n_classes
+
+    def match(self, text: str, pos: int = 0) -> tuple[int, int] | None:
+        """
+        Matches the DFA at a position of a text.
+
+        Args:
+            text (str): The text to match.
+            pos (int, optional): The position where the match must start. Defaults to 0.
+
+        Returns:
+            tuple[int, int] | None: The span of the longest match starting at pos, or None.
+        """
+        end = self._scan(text, pos)
+        return None if end < 0 else (pos, end)
+
+    def fullmatch(self, text: str) -> bool:
+        """
+        Checks if the DFA accepts the whole text.
+
+        Args:
+            text (str): The text to check.
+
+        Returns:
+            bool: True if the text is in the language of the DFA, False otherwise.
+        """
+        return bool(self.accepts[self.run(text)])
+
+    def match_many(self, strings: list[str]):
+        """
+        Checks which strings of a batch the DFA accepts.
+
+        With NumPy, the batch is joined and translated to classes in one go.
+        The strings are ordered by decreasing length with a radix sort, and
+        their states advance together, one position at a time, by fancy
+        indexing into the premultiplied transition table; at position j only
+        the strings longer than j take part, and they are a prefix of the
+        order. Without NumPy every string is checked with fullmatch.
+
+        Args:
+            strings (list[str]): The strings to check.
+
+        Returns:
+            list[bool]: Whether the DFA accepts every string.
+        """
+        if numpy is None or not strings:
+            return [self.fullmatch(s) for s in strings]
+
+        lengths = numpy.fromiter(
+            map(len, strings), dtype=numpy.intp, count=len(strings)
+        )
+        width = int(lengths.max())
+
+        joined = "".join(strings).translate(self.classes)
+        if self.n_classes <= 256:
+            flat = numpy.frombuffer(joined.encode("latin-1"), dtype=numpy.uint8)
+        else:
+            flat = numpy.frombuffer(joined.encode("utf-32-le"), dtype=numpy.uint32)
+
+        starts = numpy.zeros(len(strings), dtype=numpy.intp)
+        numpy.cumsum(lengths[:-1], out=starts[1:])
+
+        # A stable sort of 16-bit keys is a radix sort.
+        keys = width - lengths
+        if width < 1 << 16:
+            keys = keys.astype(numpy.uint16)
+        order = numpy.argsort(keys, kind="stable")
+        starts = starts[order]
+
+        # The number of strings longer than every position.
+        active = len(strings) - numpy.cumsum(numpy.bincount(lengths))
+
+        jump = numpy.frombuffer(self._jump, dtype=numpy.int32).astype(numpy.intp)
+        states = numpy.zeros(len(strings), dtype=numpy.intp)
+
+        for j in range(width):
+            k = active[j]
+            states[:k] = jump[states[:k] + flat[starts[:k] + j]]
+
+        accepted = numpy.empty(len(strings), dtype=bool)
+        accepted[order] = numpy.frombuffer(bytes(self._accepts), dtype=bool)[states]
+        return accepted.tolist()
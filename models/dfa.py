@@ -1,11 +1,11 @@
-from collections import deque
-
 from multipledispatch import dispatch
 
 from models.automata import Automata
-from models.nfa import NFA
+from models.compact_nfa import CompactNFA
+from models.compiled_dfa import CompiledDFA
+from utilities.alphabet import compress
 from utilities.state import State
-from utilities.symbol import Symbol
+from utilities.symbol import Symbol, partition
 from utilities.transition import Transition
 
 
@@ -17,56 +17,67 @@ class DFA(Automata):
 
     Attributes:
         alpha (dict[int, Symbol]): The alphabet of the DFA.
-        nfa (NFA): The corresponding NFA.
+        nfa (CompactNFA): The corresponding NFA.
         i_state (State): The initial state of the DFA.
         f_states (list[State]): The list of final states of the DFA.
         states (list[State]): The list of all states in the DFA.
         trans (list[Transition]): The list of transitions in the DFA.
+        table (list[dict[int, int]]): For every state id, the destiny id of each alphabet key.
+        finals (list[bool]): For every state id, whether the state is final.
+        subsets (list[tuple[int, ...]]): For every state id, the sorted NFA states of its subset, if built from an NFA.
+        tags (list[frozenset[int]] | None): For every state id, the ids of the patterns it accepts, if tagged.
 
     Methods:
         __init__(self, alpha: dict[int, Symbol])
             Initializes the DFA with the given alphabet.
 
-        __init__(self, alpha: dict[int, Symbol], nfa: NFA)
-            Initializes the DFA with the given alphabet and corresponding NFA.
+        __init__(self, alpha: dict[int, Symbol], nfa: CompactNFA)
+            Initializes the DFA with the atoms of the given alphabet and corresponding NFA.
 
-        add_state(self, state: State, is_final: bool = False)
-            Adds a state to the DFA.
+        from_table(alpha: dict[int, Symbol], table: list[dict[int, int]], finals: list[bool], tags: list[frozenset[int]] | None = None) -> DFA
+            Creates a DFA from a transition table.
 
-        add_transition(self, origin: State, symbol: Symbol, destiny: State)
-            Adds a transition to the DFA.
+        from_automata(automata: Automata) -> DFA
+            Creates a table DFA from the states and transitions of a deterministic automaton.
 
-        move(self, nfa: NFA, current: list[State], symbol: Symbol) -> list[State]
-            Computes the next states given the current states and a symbol.
+        config(self)
+            Configures the DFA by computing its states and transitions.
 
-        move_state(self, state: State, v: str) -> State | None
-            Computes the next state given a state and a symbol.
+        minimize(self, tags: list[frozenset[int]] | None = None) -> DFA
+            Minimizes the DFA by merging equivalent states with the same tags.
 
-        e_closure(self, nfa: NFA, current: list[State]) -> list[State]
-            Computes the epsilon closure of a set of states.
+        compile(self) -> CompiledDFA
+            Compiles the DFA to a dense transition table for matching.
 
-        config(self)
-            Configures the DFA by computing its states and transitions.
+        equivalent(a: Automata, b: Automata) -> tuple[bool, str | None]
+            Checks if two DFAs accept the same language.
 
-        minimize(self) -> DFA
-            Minimizes the DFA by merging equivalent states.
+        includes(a: Automata, b: Automata) -> tuple[bool, str | None]
+            Checks if the language of a DFA includes the language of another.
 
     """
 
     @dispatch(dict)
     def __init__(self, alpha: dict[int, Symbol]):
         super().__init__(alpha=alpha)
-
-    @dispatch(dict, NFA)
-    def __init__(self, alpha: dict[int, Symbol], nfa: NFA):
-        super().__init__(alpha=alpha, nfa=nfa)
-        epsilon = Symbol("ε")
-        self.alpha.pop(epsilon.ord, None)
+        self.table: list[dict[int, int]] = []
+        self.finals: list[bool] = []
+        self.subsets: list[tuple[int, ...]] = []
+        self.tags: list[frozenset[int]] | None = None
+
+    @dispatch(dict, CompactNFA)
+    def __init__(self, alpha: dict[int, Symbol], nfa: CompactNFA):
+        atoms = {a.ord: a for a in partition(alpha.values())}
+        super().__init__(alpha=atoms, nfa=nfa)
+        self.table: list[dict[int, int]] = []
+        self.finals: list[bool] = []
+        self.subsets: list[tuple[int, ...]] = []
+        self.tags: list[frozenset[int]] | None = None
 
         self.config()
 
     @property
-    def nfa(self) -> NFA:
+    def nfa(self) -> CompactNFA:
         return getattr(self, "__nfa")
 
     @property
@@ -77,156 +88,487 @@ class DFA(Automata):
     def i_state(self, value):
         setattr(self, "__i_state", value)
 
-    def add_state(self, state: State, is_final: bool = False):
-        if state:
-            if state not in self.states:
-                self.states.append(state)
-
-            if is_final:
-                self.f_states.append(state)
-
-    def add_transition(self, origin: State, symbol: Symbol, destiny: State):
-        if all([origin, symbol, destiny]):
-            tran = Transition(origin, symbol, destiny)
-            if tran not in self.trans:
-                self.trans.append(tran)
-
-    def move(self, nfa: NFA, current: list[State], symbol: Symbol) -> list[State]:
-        next_states = []
-
-        for s in current:
-            for t in nfa.trans:
-                if t.origin.id == s.id and t.symbol.value == symbol.value:
-                    if t.destiny not in next_states:
-                        next_states.append(t.destiny)
-
-        return next_states
-
-    def move_state(self, state: State, v: str) -> State | None:
-        for t in self.trans:
-            if t.origin.id == state.id and t.symbol.value == v:
-                return t.destiny
-
-    def e_closure(self, nfa: NFA, current: list[State]) -> list[State]:
-        e_states = current
-
-        while True:
-            new_states = []
-            for s in e_states:
-                for t in nfa.trans:
-                    if t.origin.id == s.id and t.symbol.value == "ε":
-                        if t.destiny not in e_states and t.destiny not in new_states:
-                            new_states.append(t.destiny)
-
-            if not new_states:
-                break
-
-            e_states.extend(new_states)
-
-        return e_states
-
-    def config(self):
-        curr_states = self.e_closure(self.nfa, [self.nfa.i_state])
-        base_states = [curr_states]
-        unfd_states = [curr_states]
-
-        if self.nfa.f_state in curr_states:
-            self.i_state = State(0, 3)
-            self.f_states.append(self.i_state)
-        else:
-            self.i_state = State(0, 1)
-
-        self.states.append(self.i_state)
-
-        while unfd_states:
-            current = unfd_states.pop() or curr_states
-
-            for v in self.alpha.values():
-                move_res = self.move(self.nfa, current, v)
-                move_res = self.e_closure(self.nfa, move_res)
-                move_res.sort(key=lambda x: x.id)
-
-                if move_res not in base_states:
-                    if move_res:
-                        base_states.append(move_res)
-                        unfd_states.append(move_res)
-
-                        new_state = State(
-                            len(base_states) - 1,
-                            self.nfa.f_state in move_res and 3 or 1,
+    @staticmethod
+    def from_table(
+        alpha: dict[int, Symbol],
+        table: list[dict[int, int]],
+        finals: list[bool],
+        tags: list[frozenset[int]] | None = None,
+    ):
+        """
+        Creates a DFA from a transition table.
+
+        State 0 is the initial state.
+
+        Args:
+            alpha (dict[int, Symbol]): The alphabet of the DFA.
+            table (list[dict[int, int]]): For every state, the destiny of each alphabet key.
+            finals (list[bool]): Whether every state is final.
+            tags (list[frozenset[int]], optional): The pattern ids accepted by every state. Defaults to None.
+
+        Returns:
+            DFA: The DFA described by the table.
+        """
+        dfa = DFA(alpha)
+        dfa._load(table, finals, tags)
+        return dfa
+
+    @staticmethod
+    def from_automata(automata: Automata):
+        """
+        Creates a table DFA from the states and transitions of a deterministic automaton.
+
+        This is how automata loaded from the database, which have no table, are
+        compared. The labels of the transitions are split into atoms, so labels
+        that overlap are handled. A DFA that already has a table is returned as is.
+
+        Args:
+            automata (Automata): The deterministic automaton.
+
+        Raises:
+            ValueError: If the automaton has no initial state or is not deterministic.
+
+        Returns:
+            DFA: The DFA with the same states and language.
+        """
+        if isinstance(automata, DFA) and automata.table:
+            return automata
+
+        if automata.i_state is None:
+            raise ValueError("The automaton has no initial state")
+
+        ids = {automata.i_state.id: 0}
+        for state in [*automata.states, *automata.f_states]:
+            ids.setdefault(state.id, len(ids))
+        for t in automata.trans:
+            ids.setdefault(t.origin.id, len(ids))
+            ids.setdefault(t.destiny.id, len(ids))
+
+        atoms = partition({t.symbol for t in automata.trans})
+        alpha = {atom.ord: atom for atom in atoms}
+        table: list[dict[int, int]] = [{} for _ in ids]
+
+        for t in automata.trans:
+            row, destiny = table[ids[t.origin.id]], ids[t.destiny.id]
+            for atom in atoms:
+                if t.symbol.contains(atom.first):
+                    if row.setdefault(atom.ord, destiny) != destiny:
+                        raise ValueError(
+                            f"The automaton is not deterministic at state {t.origin.id}"
                         )
 
-                        if self.nfa.f_state in move_res:
-                            self.f_states.append(new_state)
+        final_ids = {state.id for state in automata.f_states}
+        finals = [False] * len(ids)
+        for state_id, i in ids.items():
+            finals[i] = state_id in final_ids
+
+        return DFA.from_table(alpha, table, finals)
+
+    def _load(
+        self,
+        table: list[dict[int, int]],
+        finals: list[bool],
+        tags: list[frozenset[int]] | None = None,
+    ):
+        """
+        Fills the states and transitions of the DFA from a transition table.
+
+        Args:
+            table (list[dict[int, int]]): For every state, the destiny of each alphabet key.
+            finals (list[bool]): Whether every state is final.
+            tags (list[frozenset[int]], optional): The pattern ids accepted by every state. Defaults to None.
+        """
+        self.table = table
+        self.finals = finals
+        self.tags = tags
+        states = [State(i, finals[i] and 3 or 1) for i in range(len(table))]
+
+        self.states.extend(states)
+        self.f_states.extend(s for s, f in zip(states, finals) if f)
+        self.i_state = states[0]
+
+        for origin, row in zip(states, table):
+            for key, destiny in row.items():
+                self.trans.append(Transition(origin, self.alpha[key], states[destiny]))
 
-                        self.states.append(new_state)
-                        i_s = base_states.index(current)
-                        f_s = base_states.index(move_res)
-                        tran = Transition(self.states[i_s], v, self.states[f_s])
-
-                        self.trans.append(tran)
-                else:
-                    i_s = base_states.index(current)
-                    f_s = base_states.index(move_res)
-                    tran = Transition(self.states[i_s], v, self.states[f_s])
-
-                    if tran not in self.trans:
-                        self.trans.append(tran)
-
-    def minimize(self):
-        accept_states = frozenset(self.f_states)
-        reject_states = frozenset(self.states).difference(accept_states)
-
-        partitions = set([accept_states, reject_states])
-        worklist = deque([accept_states, reject_states])
+    def config(self):
+        """
+        Builds the states and transitions of the DFA with the subset construction.
+
+        Subsets of NFA states are sorted tuples of their members, mapped to
+        their DFA state id by a dict, and the transitions go to a table indexed
+        by state id and atom. Every subset is walked through its members, so
+        the work grows with the size of the resulting DFA and not with the
+        number of NFA states.
+        """
+        nfa = self.nfa
+        atoms = list(self.alpha.values())
+        sym_index, sym_labels, sym_targets = (
+            nfa.sym_index,
+            nfa.sym_labels,
+            nfa.sym_targets,
+        )
+        finals = set(nfa.f_states)
+
+        # The atoms matched by every edge label.
+        covers = [
+            [a for a, atom in enumerate(atoms) if symbol.contains(atom.first)]
+            for symbol in nfa.symbols
+        ]
+
+        start = nfa.closure_members((nfa.i_state,))
+        ids = {start: 0}
+        subsets = [start]
+        table: list[dict[int, int]] = []
+
+        for subset in subsets:
+            targets: dict[int, list[int]] = {}
+
+            for s in subset:
+                for k in range(sym_index[s], sym_index[s + 1]):
+                    d = sym_targets[k]
+                    for a in covers[sym_labels[k]]:
+                        targets.setdefault(a, []).append(d)
+
+            row = {}
+            for a in sorted(targets):
+                target = nfa.closure_members(targets[a])
+                destiny = ids.get(target)
+
+                if destiny is None:
+                    destiny = ids[target] = len(subsets)
+                    subsets.append(target)
+
+                row[atoms[a].ord] = destiny
+
+            table.append(row)
+
+        self.subsets = subsets
+        self._load(table, [not finals.isdisjoint(s) for s in subsets])
+
+    def minimize(self, tags: list[frozenset[int]] | None = None):
+        """
+        Minimizes the DFA with Hopcroft's partition refinement.
+
+        The refinement runs over the integer transition table. Missing
+        transitions go to an implicit dead state, which is dropped again from
+        the result together with every state that cannot be reached. When tags
+        are given, states accepting different pattern ids are never merged.
+
+        The alphabet is compressed into classes of keys with identical columns
+        before the refinement, and again in the result, where merged states
+        may have made more columns equal.
+
+        Args:
+            tags (list[frozenset[int]], optional): The pattern ids accepted by
+                every state; empty for the states that are not final. Defaults to None.
+
+        Returns:
+            DFA: The minimal DFA, whose state 0 is the initial state.
+        """
+        alpha, classes = compress(self.alpha, self.table)
+        keys = list(alpha)
+        n = len(classes)
+        dead = n
+
+        # The transitions of every class, and their inverse.
+        delta = []
+        inverse = []
+        for key in keys:
+            column = [row.get(key, dead) for row in classes]
+            column.append(dead)
+            preimage: list[list[int]] = [[] for _ in range(n + 1)]
+            for origin, destiny in enumerate(column):
+                preimage[destiny].append(origin)
+            delta.append(column)
+            inverse.append(preimage)
+
+        finals = self._finals()
+        labels = finals if tags is None else [*tags, frozenset()]
+
+        # The initial blocks group the states with the same label. Blocks are
+        # contiguous slices of elems; the marked states of a block are moved
+        # to the front of its slice, up to mid.
+        groups: dict[object, list[int]] = {}
+        for s in range(n + 1):
+            groups.setdefault(labels[s], []).append(s)
+
+        elems: list[int] = []
+        first: list[int] = []
+        end: list[int] = []
+        blk = [0] * (n + 1)
+
+        for b, members in enumerate(groups.values()):
+            first.append(len(elems))
+            elems.extend(members)
+            end.append(len(elems))
+            for s in members:
+                blk[s] = b
+
+        loc = [0] * (n + 1)
+        for i, s in enumerate(elems):
+            loc[s] = i
+
+        mid = first[:]
+
+        # Every block but the largest one starts as a splitter.
+        largest = max(range(len(first)), key=lambda b: end[b] - first[b])
+        worklist = [
+            (b, c) for b in range(len(first)) if b != largest for c in range(len(keys))
+        ]
 
         while worklist:
-            partition = worklist.popleft()
-
-            for a in self.alpha.values():
-                mapping = {}
-
-                for state in partition:
-                    next_state = self.move_state(state, a.value)
-                    sub_part = mapping.get(next_state, None)
-
-                    if not sub_part:
-                        sub_part = set()
-                        mapping[next_state] = sub_part
-
-                    sub_part.add(state)
-
-                for sub_part in mapping.values():
-                    if len(sub_part) < len(partition):
-                        if partition in partitions:
-                            partitions.remove(frozenset(partition))
-                        partitions.add(frozenset(sub_part))
-                        worklist.append(sub_part)
-
-        state_map = {}
-        start_state = self.i_state
-
-        for part in partitions:
-            if part:
-                rep = next(iter(part))
-                for state in part:
-                    state_map[state] = rep
-
-                if start_state in part:
-                    start_state = rep
-
-        minimized = DFA(self.alpha)
-        minimized.i_state = start_state
-
-        for part in partitions:
-            if part:
-                rep = next(iter(part))
-                is_accept = any(state in accept_states for state in part)
-                minimized.add_state(rep, is_accept)
-
-                for a in self.alpha.values():
-                    map_state = self.move_state(rep, a.value)
-                    mapped_state = state_map.get(map_state)
-                    minimized.add_transition(rep, a, mapped_state)
+            splitter, c = worklist.pop()
+            preimage = inverse[c]
+            touched = []
+
+            for t in elems[first[splitter] : end[splitter]]:
+                for s in preimage[t]:
+                    b = blk[s]
+                    m = mid[b]
+                    i = loc[s]
+                    if i < m:
+                        continue
+
+                    other = elems[m]
+                    elems[m], loc[s] = s, m
+                    elems[i], loc[other] = other, i
+                    mid[b] = m + 1
+                    if m == first[b]:
+                        touched.append(b)
+
+            for b in touched:
+                m = mid[b]
+                mid[b] = first[b]
+                if m == end[b]:
+                    continue
+
+                # The smaller half becomes the new block, so every state
+                # changes block O(log n) times.
+                nb = len(first)
+                if m - first[b] <= end[b] - m:
+                    first.append(first[b])
+                    end.append(m)
+                    first[b] = m
+                else:
+                    first.append(m)
+                    end.append(end[b])
+                    end[b] = m
+
+                mid[b] = first[b]
+                mid.append(first[nb])
+                for i in range(first[nb], end[nb]):
+                    blk[elems[i]] = nb
+
+                worklist.extend((nb, c) for c in range(len(keys)))
+
+        # Number the live blocks in breadth-first order from the initial one.
+        ids = {blk[0]: 0}
+        order = [blk[0]]
+        table: list[dict[int, int]] = []
+
+        for b in order:
+            s = elems[first[b]]
+            row = {}
+            for c, key in enumerate(keys):
+                d = blk[delta[c][s]]
+                if d == blk[dead]:
+                    continue
+                if d not in ids:
+                    ids[d] = len(order)
+                    order.append(d)
+                row[key] = ids[d]
+            table.append(row)
+
+        reps = [elems[first[b]] for b in order]
+        alpha, table = compress(alpha, table)
+        return DFA.from_table(
+            alpha,
+            table,
+            [finals[s] for s in reps],
+            None if tags is None else [labels[s] for s in reps],
+        )
+
+    def compile(self) -> CompiledDFA:
+        """
+        Compiles the DFA to a dense transition table for matching.
+
+        The alphabet is compressed first, so the table has one column per
+        class of equivalent characters.
+
+        Returns:
+            CompiledDFA: The compiled DFA.
+        """
+        alpha, table = compress(self.alpha, self.table)
+        return CompiledDFA(alpha, table, self.finals)
+
+    def _finals(self) -> list[bool]:
+        """
+        Returns whether every state is final, plus the implicit dead state.
+
+        The states are read from the finals list, which follows the order of
+        the table, and not from self.states, which reorganize sorts and renames.
+
+        Returns:
+            list[bool]: The finality of every state id, and False for the dead state.
+        """
+        return self.finals + [False]
+
+    def _step(self, state: int, key: int | None) -> int:
+        """
+        Returns the destiny of a state on an alphabet key in the transition table.
+
+        Args:
+            state (int): The id of the state, or the dead state len(table).
+            key (int | None): The alphabet key, or None if it is not in the alphabet.
+
+        Returns:
+            int: The id of the destiny, or the dead state if there is no transition.
+        """
+        dead = len(self.table)
+        if state == dead or key is None:
+            return dead
+        return self.table[state].get(key, dead)
+
+    @staticmethod
+    def _columns(a: "DFA", b: "DFA") -> list[tuple[int | None, int | None, str]]:
+        """
+        Splits the alphabets of two DFAs into their common atoms.
+
+        Args:
+            a (DFA): The first DFA.
+            b (DFA): The second DFA.
+
+        Returns:
+            list[tuple[int | None, int | None, str]]: For every common atom, the key
+            of the atom in each alphabet (None if missing) and a character of it.
+        """
+        columns = []
+
+        for atom in partition([*a.alpha.values(), *b.alpha.values()]):
+            code = atom.first
+            key_a = next((k for k, v in a.alpha.items() if v.contains(code)), None)
+            key_b = next((k for k, v in b.alpha.items() if v.contains(code)), None)
+            columns.append((key_a, key_b, chr(code)))
+
+        return columns
+
+    @staticmethod
+    def _word(trail: list[tuple[int, int, int, str]], k: int) -> str:
+        """
+        Rebuilds the word that leads to an entry of a search trail.
+
+        Args:
+            trail (list[tuple[int, int, int, str]]): The (p, q, previous entry, character) entries.
+            k (int): The index of the entry.
+
+        Returns:
+            str: The characters read from the initial pair to the entry.
+        """
+        chars = []
+        while k > 0:
+            _, _, k, char = trail[k]
+            chars.append(char)
+        return "".join(reversed(chars))
+
+    @staticmethod
+    def equivalent(a: Automata, b: Automata) -> tuple[bool, str | None]:
+        """
+        Checks if two DFAs accept the same language, with Hopcroft and Karp's algorithm.
+
+        Pairs of states reached by the same word are merged in a union-find
+        structure and only explored when they join two different classes, so
+        the check runs in near-linear time in the size of the DFAs. It stops at
+        the first pair where one state is final and the other is not. Automata
+        without a table, like the ones loaded from the database, are converted
+        with from_automata first.
+
+        Args:
+            a (Automata): The first DFA.
+            b (Automata): The second DFA.
+
+        Raises:
+            ValueError: If an automaton is not deterministic.
+
+        Returns:
+            tuple[bool, str | None]: Whether the DFAs are equivalent and, if not, a
+            word accepted by exactly one of them.
+        """
+        a, b = DFA.from_automata(a), DFA.from_automata(b)
+        columns = DFA._columns(a, b)
+        finals_a, finals_b = a._finals(), b._finals()
+        offset = len(finals_a)
+        parent = list(range(offset + len(finals_b)))
+
+        def find(x: int) -> int:
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]
+                x = parent[x]
+            return x
+
+        if finals_a[0] != finals_b[0]:
+            return False, ""
+
+        parent[offset] = 0
+        trail = [(0, 0, -1, "")]
+
+        for k, (p, q, _, _) in enumerate(trail):
+            for key_a, key_b, char in columns:
+                p_next, q_next = a._step(p, key_a), b._step(q, key_b)
+                root_p, root_q = find(p_next), find(offset + q_next)
+
+                if root_p == root_q:
+                    continue
+
+                parent[root_q] = root_p
+                trail.append((p_next, q_next, k, char))
+
+                if finals_a[p_next] != finals_b[q_next]:
+                    return False, DFA._word(trail, len(trail) - 1)
+
+        return True, None
+
+    @staticmethod
+    def includes(a: Automata, b: Automata) -> tuple[bool, str | None]:
+        """
+        Checks if the language of a DFA includes the language of another.
+
+        The reachable pairs of the product automaton are explored breadth-first,
+        stopping at the first pair where b accepts and a does not. Automata
+        without a table are converted with from_automata first.
+
+        Args:
+            a (Automata): The DFA whose language should include the other.
+            b (Automata): The DFA whose language should be included.
+
+        Raises:
+            ValueError: If an automaton is not deterministic.
+
+        Returns:
+            tuple[bool, str | None]: Whether every word accepted by b is accepted
+            by a and, if not, a word accepted by b but not by a.
+        """
+        a, b = DFA.from_automata(a), DFA.from_automata(b)
+        columns = DFA._columns(a, b)
+        finals_a, finals_b = a._finals(), b._finals()
+
+        if finals_b[0] and not finals_a[0]:
+            return False, ""
+
+        seen = {(0, 0)}
+        trail = [(0, 0, -1, "")]
+
+        for k, (p, q, _, _) in enumerate(trail):
+            for key_a, key_b, char in columns:
+                pair = a._step(p, key_a), b._step(q, key_b)
+
+                if pair in seen:
+                    continue
+
+                seen.add(pair)
+                trail.append((*pair, k, char))
+
+                if finals_b[pair[1]] and not finals_a[pair[0]]:
+                    return False, DFA._word(trail, len(trail) - 1)
 
-        return minimized
+        return True, None
@@ -0,0 +1,324 @@
+import hashlib
+import marshal
+import os
+import sys
+import tempfile
+
+from interfaces.automata_interface import DATABASE_DIR, GRAMMAR_VERSION
+from models.compiled_dfa import MAX_SCAN_BLOCK, SCAN_BLOCK, CompiledDFA
+from models.dfa import DFA
+from utilities.parser import Parser
+from utilities.tompson import Thompson
+
+# Bumped whenever the generated source changes, so stale cached code is ignored.
+CODEGEN_VERSION = 2
+
+CACHE_DIR = os.path.join(DATABASE_DIR, "generated")
+
+# The most exit classes of a state skipped with str.find, and the most states
+# dispatched with a flat if-chain.
+MAX_EXITS = 3
+DISPATCH_CHAIN = 4
+
+
+class GeneratedDFA:
+    """
+    Represents a DFA compiled to specialized Python source.
+
+    Every state of the compiled DFA becomes a branch inside a single loop, and
+    every branch tests the class of the next character against string
+    constants, grouped by destiny. Entering a final state records the end of
+    the match inline, so the accept bitmap and the transition table are never
+    read. A state that loops on all classes but a few skips its run with
+    str.find, which scans in C. That makes it much faster than CompiledDFA on
+    texts with long runs in such states, while on dense DFAs that change state
+    at almost every character the table lookup of CompiledDFA stays faster.
+
+    The source is a module that also rebuilds the class map of the DFA, so the
+    code object compiled from it is self-contained. It is cached with marshal
+    under database/generated, next to the SQLite store, keyed by the regular
+    expression and the Python version; later processes load it without parsing
+    the regular expression or building any automaton.
+
+    Args:
+        code: The compiled code object of the generated module.
+
+    Attributes:
+        scan (Callable[[str, int], int]): The generated function, which returns the
+        end of the longest match at a position, or -1.
+    """
+
+    def __init__(self, code):
+        namespace = {}
+        exec(code, namespace)
+        self.scan = namespace["scan"]
+
+    @staticmethod
+    def _transitions(dfa: CompiledDFA, s: int, codes: list[int], indent: str):
+        """
+        Generates the test of the class of the next character in a state.
+
+        The classes are grouped by destiny, largest group first, and every
+        class outside the groups goes to the dead state.
+
+        Args:
+            dfa (CompiledDFA): The compiled DFA.
+            s (int): The state.
+            codes (list[int]): The classes to test.
+            indent (str): The indentation of the generated lines.
+
+        Returns:
+            list[str]: The generated lines.
+        """
+        groups: dict[int, list[int]] = {}
+        for c in codes:
+            destiny = dfa.next_state[s * dfa.n_classes + c]
+            if destiny != dfa.dead:
+                groups.setdefault(destiny, []).append(c)
+
+        if not groups:
+            return [f"{indent}break"]
+
+        lines = [f"{indent}c = codes[i]", f"{indent}i += 1"]
+        ordered = sorted(groups.items(), key=lambda group: -len(group[1]))
+
+        for k, (destiny, members) in enumerate(ordered):
+            chars = "".join(map(chr, members))
+            test = f"c == {chars!r}" if len(chars) == 1 else f"c in {chars!r}"
+            lines.append(f"{indent}{'elif' if k else 'if'} {test}:")
+
+            if destiny != s:
+                lines.append(f"{indent}    state = {destiny}")
+            if dfa.accepts[destiny]:
+                lines.append(f"{indent}    end = pos + i")
+            elif destiny == s:
+                lines.append(f"{indent}    pass")
+
+        return lines + [f"{indent}else:", f"{indent}    break"]
+
+    @staticmethod
+    def source(dfa: CompiledDFA) -> str:
+        """
+        Generates the Python source of a compiled DFA.
+
+        The branch of a state is found with a binary tree of comparisons on the
+        state number, so dispatch costs a logarithmic number of tests. A state
+        that loops on more code points than it leaves on, through at most
+        MAX_EXITS classes, jumps to the next exit with str.find. The position
+        found for every exit is kept in a local until the scan passes it, so
+        each exit is searched once per occurrence in a block. Like CompiledDFA,
+        the text is translated in blocks that double in size, so a run that
+        dies early does not translate the rest of the text.
+
+        Args:
+            dfa (CompiledDFA): The compiled DFA.
+
+        Returns:
+            str: The source of a module defining CLASSES and scan(text, pos=0).
+        """
+        n_classes, dead = dfa.n_classes, dfa.dead
+        classes = dfa.classes
+        ranges = list(zip(classes._lows, classes._highs, classes._classes))
+
+        # The class of the code points outside every range never occurs if the
+        # ranges cover every code point.
+        covered = sum(hi - lo + 1 for lo, hi, _ in ranges) == sys.maxunicode + 1
+        codes = list(range(n_classes - 1 if covered else n_classes))
+
+        sizes = [0] * n_classes
+        sizes[-1] = sys.maxunicode + 1
+        for lo, hi, c in ranges:
+            sizes[c] += hi - lo + 1
+            sizes[-1] -= hi - lo + 1
+
+        bodies: list[list[str]] = []
+        n_finds = 0
+
+        for s in range(dead):
+            final = dfa.accepts[s]
+            row = dfa.next_state[s * n_classes : (s + 1) * n_classes]
+            exits = [c for c in codes if row[c] != s]
+            body = []
+
+            # Skipping only pays off if the runs in the state are likely long.
+            loops = sum(sizes[c] for c in codes) - sum(sizes[c] for c in exits)
+            if len(exits) <= MAX_EXITS and loops > sum(sizes[c] for c in exits):
+                found = []
+                for c in exits:
+                    name = f"f{n_finds}"
+                    n_finds += 1
+                    found.append(name)
+                    body += [
+                        f"if {name} < i:",
+                        f"    {name} = codes.find({chr(c)!r}, i)",
+                        f"    if {name} < 0:",
+                        f"        {name} = n",
+                    ]
+
+                if not found:
+                    body.append("i = n")
+                elif len(found) == 1:
+                    body.append(f"i = {found[0]}")
+                else:
+                    body.append(f"i = min({', '.join(found)})")
+
+                if final:
+                    body.append("end = pos + i")
+                body += ["if i == n:", "    continue"]
+                codes_left = exits
+            else:
+                codes_left = codes
+
+            body += GeneratedDFA._transitions(dfa, s, codes_left, "")
+            bodies.append(body)
+
+        lines = [
+            "from models.compiled_dfa import ClassMap",
+            "",
+            f"CLASSES = ClassMap({ranges!r}, {classes._other})",
+            "",
+            "",
+            "def scan(text, pos=0):",
+            f"    end = {'pos' if dfa.accepts[0] else -1}",
+            "    state = 0",
+            f"    size = {SCAN_BLOCK}",
+            "    while pos < len(text):",
+            "        codes = text[pos : pos + size].translate(CLASSES)",
+            "        n = len(codes)",
+            "        i = 0",
+        ]
+        lines += [f"        f{k} = -1" for k in range(n_finds)]
+        lines.append("        while i < n:")
+
+        def dispatch(lo: int, hi: int, indent: str):
+            if hi - lo <= DISPATCH_CHAIN:
+                for s in range(lo, hi):
+                    if s == hi - 1:
+                        test = "else:" if s > lo else ""
+                    else:
+                        test = f"{'elif' if s > lo else 'if'} state == {s}:"
+
+                    if test:
+                        lines.append(f"{indent}{test}")
+                        lines.extend(f"{indent}    {line}" for line in bodies[s])
+                    else:
+                        lines.extend(f"{indent}{line}" for line in bodies[s])
+                return
+
+            mid = (lo + hi) // 2
+            lines.append(f"{indent}if state < {mid}:")
+            dispatch(lo, mid, indent + "    ")
+            lines.append(f"{indent}else:")
+            dispatch(mid, hi, indent + "    ")
+
+        dispatch(0, dead, "            ")
+
+        lines += [
+            "        else:",
+            "            pos += n",
+            f"            size = min(2 * size, {MAX_SCAN_BLOCK})",
+            "            continue",
+            "        break",
+            "    return end",
+            "",
+        ]
+        return "\n".join(lines)
+
+    @staticmethod
+    def _cache_path(regex: str, cache_dir: str) -> str:
+        """
+        Returns the path of the cached code object of a regular expression.
+
+        Args:
+            regex (str): The regular expression.
+            cache_dir (str): The cache directory.
+
+        Returns:
+            str: The path of the cache file.
+        """
+        key = hashlib.sha256(
+            f"{GRAMMAR_VERSION}\0{CODEGEN_VERSION}\0{regex}".encode()
+        ).hexdigest()
+        return os.path.join(cache_dir, f"{key}.{sys.implementation.cache_tag}.bin")
+
+    @staticmethod
+    def from_compiled(dfa: CompiledDFA, filename: str = "<generated dfa>"):
+        """
+        Generates and compiles the matcher of a compiled DFA, without caching.
+
+        Args:
+            dfa (CompiledDFA): The compiled DFA.
+            filename (str, optional): The file name shown in tracebacks. Defaults to "<generated dfa>".
+
+        Returns:
+            GeneratedDFA: The generated matcher.
+        """
+        return GeneratedDFA(compile(GeneratedDFA.source(dfa), filename, "exec"))
+
+    @staticmethod
+    def from_regex(regex: str, cache_dir: str = CACHE_DIR):
+        """
+        Loads the generated matcher of a regular expression, generating it if needed.
+
+        A missing, unreadable or corrupt cache file is regenerated. Failing to
+        write the cache is not an error, the matcher is just not cached.
+
+        Args:
+            regex (str): The regular expression.
+            cache_dir (str, optional): The cache directory. Defaults to database/generated.
+
+        Raises:
+            RegexSyntaxError: If the regular expression is not valid.
+
+        Returns:
+            GeneratedDFA: The generated matcher.
+        """
+        path = GeneratedDFA._cache_path(regex, cache_dir)
+
+        try:
+            with open(path, "rb") as file:
+                return GeneratedDFA(marshal.load(file))
+        except (OSError, EOFError, ValueError, TypeError):
+            pass
+
+        parser = Parser(regex)
+        nfa = Thompson(parser.alpha).subset_construction(parser.parse().root)
+        dfa = DFA(parser.alpha, nfa).minimize().compile()
+        code = compile(GeneratedDFA.source(dfa), f"<dfa {regex}>", "exec")
+
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            fd, temp = tempfile.mkstemp(dir=cache_dir)
+            with os.fdopen(fd, "wb") as file:
+                marshal.dump(code, file)
+            os.replace(temp, path)
+        except OSError:
+            pass
+
+        return GeneratedDFA(code)
+
+    def match(self, text: str, pos: int = 0) -> tuple[int, int] | None:
+        """
+        Matches the DFA at a position of a text.
+
+        Args:
+            text (str): The text to match.
+            pos (int, optional): The position where the match must start. Defaults to 0.
+
+        Returns:
+            tuple[int, int] | None: The span of the longest match starting at pos, or None.
+        """
+        end = self.scan(text, pos)
+        return None if end < 0 else (pos, end)
+
+    def fullmatch(self, text: str) -> bool:
+        """
+        Checks if the DFA accepts the whole text.
+
+        Args:
+            text (str): The text to check.
+
+        Returns:
+            bool: True if the text is in the language of the DFA, False otherwise.
+        """
+        return self.scan(text) == len(text)
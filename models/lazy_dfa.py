@@ -0,0 +1,226 @@
+import sys
+from bisect import bisect_right
+
+from models.compact_nfa import CompactNFA
+from utilities.bitset import iter_bits
+from utilities.symbol import partition
+
+UNKNOWN = -2
+DEAD = -1
+
+
+class LazyDFA:
+    """
+    Represents a DFA whose states are built only when the input reaches them.
+
+    A state is the epsilon closure of a set of NFA states, stored as a bitset.
+    Every (state, atom) step is computed once and cached in the row of the
+    state. The cache is bounded by an approximate size in bytes: when a new
+    state would exceed it, the cache is flushed and the scan goes on from the
+    current subset. If a single scan flushes too many times the cache is
+    thrashing, and the scan falls back to simulating the NFA.
+
+    Args:
+        nfa (CompactNFA): The NFA to run.
+        max_bytes (int, optional): The approximate size cap of the state cache. Defaults to 8 MiB.
+        max_flushes (int, optional): The flushes allowed in one scan before falling back to the NFA. Defaults to 4.
+
+    Attributes:
+        atoms (list[Symbol]): The disjoint atoms of the NFA symbols, the columns of the rows.
+        size (int): The approximate size of the cached states, in bytes.
+        flushes (int): The number of times the cache was flushed.
+        fallbacks (int): The number of scans answered by the NFA simulation.
+    """
+
+    def __init__(
+        self, nfa: CompactNFA, max_bytes: int = 8 * 1024 * 1024, max_flushes: int = 4
+    ):
+        self.nfa = nfa
+        self.max_bytes = max_bytes
+        self.max_flushes = max_flushes
+
+        self.atoms = partition(nfa.symbols)
+        self._covers = [
+            frozenset(
+                a for a, atom in enumerate(self.atoms) if symbol.contains(atom.first)
+            )
+            for symbol in nfa.symbols
+        ]
+
+        # Every range of every atom, sorted, to map a code point to its atom.
+        ranges = sorted(
+            (lo, hi, a) for a, atom in enumerate(self.atoms) for lo, hi in atom.ranges
+        )
+        self._lows = [lo for lo, _, _ in ranges]
+        self._highs = [hi for _, hi, _ in ranges]
+        self._owners = [a for _, _, a in ranges]
+
+        self._start = nfa.closure(1 << nfa.i_state)
+        self.flushes = 0
+        self.fallbacks = 0
+        self.flush()
+
+    def flush(self):
+        """
+        Drops every cached state. The counters are kept.
+        """
+        self._ids: dict[int, int] = {}
+        self._subsets: list[int] = []
+        self._rows: list[list[int]] = []
+        self._finals: list[bool] = []
+        self.size = 0
+
+    def stats(self) -> dict:
+        """
+        Returns the counters of the state cache.
+
+        Returns:
+            dict: The number of cached states, their size, the flushes and the fallbacks.
+        """
+        return {
+            "states": len(self._subsets),
+            "bytes": self.size,
+            "flushes": self.flushes,
+            "fallbacks": self.fallbacks,
+        }
+
+    def _state(self, subset: int) -> int:
+        """
+        Returns the id of the state of a subset, adding it to the cache if needed.
+
+        Args:
+            subset (int): The bitset of NFA states, already closed.
+
+        Returns:
+            int: The id of the state.
+        """
+        state = self._ids.get(subset)
+
+        if state is None:
+            state = self._ids[subset] = len(self._subsets)
+            self._subsets.append(subset)
+            self._rows.append([UNKNOWN] * len(self.atoms))
+            self._finals.append(bool(subset & self.nfa.f_mask))
+            self.size += sys.getsizeof(subset) + 8 * len(self.atoms) + 64
+
+        return state
+
+    def _atom(self, code: int) -> int:
+        """
+        Returns the atom of a code point.
+
+        Args:
+            code (int): The code point.
+
+        Returns:
+            int: The index of the atom, or -1 if no symbol of the NFA matches the code point.
+        """
+        i = bisect_right(self._lows, code) - 1
+        if i >= 0 and code <= self._highs[i]:
+            return self._owners[i]
+        return -1
+
+    def _step(self, state: int, atom: int) -> int:
+        """
+        Computes and caches the destiny of a state on an atom.
+
+        Args:
+            state (int): The id of the origin state.
+            atom (int): The index of the atom.
+
+        Returns:
+            int: The id of the destiny state, or DEAD.
+        """
+        nfa = self.nfa
+        target = 0
+
+        for s in iter_bits(self._subsets[state]):
+            for k in range(nfa.sym_index[s], nfa.sym_index[s + 1]):
+                if atom in self._covers[nfa.sym_labels[k]]:
+                    target |= 1 << nfa.sym_targets[k]
+
+        destiny = self._state(nfa.closure(target)) if target else DEAD
+        self._rows[state][atom] = destiny
+        return destiny
+
+    def _run(self, text: str, pos: int) -> int | None:
+        """
+        Runs the DFA over a text from a position until it dies or the text ends.
+
+        Args:
+            text (str): The text to run over.
+            pos (int): The position where the run starts.
+
+        Returns:
+            int | None: The end of the longest accepted prefix, -1 if there is none,
+            or None if the cache thrashed and the run was abandoned.
+        """
+        state = self._state(self._start)
+        best = pos if self._finals[state] else -1
+        flushes = 0
+
+        for i in range(pos, len(text)):
+            atom = self._atom(ord(text[i]))
+            if atom < 0:
+                break
+
+            destiny = self._rows[state][atom]
+
+            if destiny == UNKNOWN:
+                if self.size > self.max_bytes:
+                    subset = self._subsets[state]
+                    self.flush()
+                    self.flushes += 1
+                    flushes += 1
+
+                    if flushes > self.max_flushes:
+                        self.fallbacks += 1
+                        return None
+
+                    state = self._state(subset)
+
+                destiny = self._step(state, atom)
+
+            if destiny == DEAD:
+                break
+
+            state = destiny
+            if self._finals[state]:
+                best = i + 1
+
+        return best
+
+    def match(self, text: str, pos: int = 0) -> tuple[int, int] | None:
+        """
+        Matches the automaton at a position of a text.
+
+        Args:
+            text (str): The text to match.
+            pos (int, optional): The position where the match must start. Defaults to 0.
+
+        Returns:
+            tuple[int, int] | None: The span of the longest match starting at pos, or None.
+        """
+        end = self._run(text, pos)
+
+        if end is None:
+            return self.nfa.match(text, pos)
+
+        return None if end < 0 else (pos, end)
+
+    def fullmatch(self, text: str) -> bool:
+        """
+        Checks if the automaton accepts the whole text.
+
+        Args:
+            text (str): The text to check.
+
+        Returns:
+            bool: True if the text is in the language of the automaton, False otherwise.
+        """
+        end = self._run(text, 0)
+
+        if end is None:
+            return self.nfa.fullmatch(text)
+
+        return end == len(text)
@@ -13,18 +13,33 @@ class Node:
         _last_pos (set[list[int]]): The set of positions where the node's symbol can occur last.
         _nullable (bool): Indicates whether the node is nullable or not.
         position (int): The position of the node in the tree.
+        captures (tuple[int, ...]): The capture groups around the node, innermost first.
 
     """
 
+    __slots__ = (
+        "_symbol",
+        "_left",
+        "_right",
+        "_first_pos",
+        "_last_pos",
+        "_nullable",
+        "position",
+        "captures",
+    )
+
     def __init__(self, symbol: Symbol, left=None, right=None):
         self._symbol = symbol
         self._left: Node = left
         self._right: Node = right
 
-        self._first_pos: set[list[int]] = set()
-        self._last_pos: set[list[int]] = set()
+        # The position sets are only used by some constructions, so they are
+        # allocated on first access to keep large trees cheap to build.
+        self._first_pos: set[int] | None = None
+        self._last_pos: set[int] | None = None
         self._nullable = False
         self.position = -1
+        self.captures: tuple[int, ...] = ()
 
     @property
     def symbol(self):
@@ -40,10 +55,14 @@ class Node:
 
     @property
     def first_pos(self):
+        if self._first_pos is None:
+            self._first_pos = set()
         return self._first_pos
 
     @property
     def last_pos(self):
+        if self._last_pos is None:
+            self._last_pos = set()
         return self._last_pos
 
     @symbol.setter
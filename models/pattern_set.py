@@ -0,0 +1,74 @@
+from models.compact_nfa import CompactNFA
+from models.dfa import DFA
+from utilities.parser import Parser
+from utilities.symbol import Symbol
+from utilities.tompson import Thompson
+
+
+class PatternSet:
+    """
+    Represents a set of regular expressions compiled to a single automaton.
+
+    The expressions are joined in one Thompson NFA whose i-th final state is
+    the final state of the i-th expression. Every state of the DFA built from
+    it is tagged with the ids of the expressions whose final state is in its
+    subset, and the DFA is minimized without merging states with different
+    tags. One pass over a text then tells every expression that matched.
+
+    Args:
+        regexes (list[str]): The regular expressions. Their ids are their indexes.
+
+    Attributes:
+        regexes (list[str]): The regular expressions.
+        alpha (dict[int, Symbol]): The union of the alphabets of the expressions.
+        nfa (CompactNFA): The combined NFA.
+        dfa (DFA): The combined, minimized DFA.
+        tags (list[frozenset[int]]): The ids of the expressions accepted by every DFA state.
+        compiled (CompiledDFA): The DFA compiled for matching.
+    """
+
+    def __init__(self, regexes: list[str]):
+        self.regexes = list(regexes)
+        self.alpha: dict[int, Symbol] = {}
+
+        roots = []
+        for regex in self.regexes:
+            parser = Parser(regex)
+            roots.append(parser.parse().root)
+            self.alpha.update(parser.alpha)
+
+        self.nfa: CompactNFA = Thompson(self.alpha).union_construction(roots)
+        self._ids = {f: i for i, f in enumerate(self.nfa.f_states)}
+
+        dfa = DFA(self.alpha, self.nfa)
+        self.dfa = dfa.minimize([self._tag(subset) for subset in dfa.subsets])
+        self.tags: list[frozenset[int]] = self.dfa.tags + [frozenset()]
+        self.compiled = self.dfa.compile()
+
+    def __len__(self) -> int:
+        return len(self.regexes)
+
+    def _tag(self, subset: tuple[int, ...]) -> frozenset[int]:
+        """
+        Returns the ids of the expressions whose final state is in a subset.
+
+        Args:
+            subset (tuple[int, ...]): The NFA states of the subset.
+
+        Returns:
+            frozenset[int]: The ids of the accepted expressions.
+        """
+        ids = self._ids
+        return frozenset(ids[s] for s in subset if s in ids)
+
+    def matches(self, text: str) -> list[int]:
+        """
+        Finds every expression of the set that matches a whole text.
+
+        Args:
+            text (str): The text to check.
+
+        Returns:
+            list[int]: The ids of the matching expressions, in increasing order.
+        """
+        return sorted(self.tags[self.compiled.run(text)])
@@ -0,0 +1,264 @@
+from models.compact_nfa import CompactNFA
+from models.compiled_dfa import ClassMap
+from models.lazy_dfa import LazyDFA
+from utilities.bitset import iter_bits
+from utilities.literals import Literals
+from utilities.parser import Parser
+from utilities.symbol import partition
+from utilities.tompson import Thompson
+
+DEAD = -1
+
+
+class Searcher:
+    """
+    Finds the leftmost-longest matches of a regular expression in a text.
+
+    A match is found in two passes. The forward pass runs a lazily built DFA
+    for .*(regex) until it dies, which gives the end of the leftmost-longest
+    match. The states of this DFA are lists of NFA state sets, ordered by the
+    position where their threads started. Once a set reaches a final state,
+    the sets that started later are dropped and no new threads are started.
+    That keeps the leftmost match and lets the DFA die. The backward pass runs
+    the lazy DFA of the reversed tree from the end of the match, and its
+    longest match gives the start.
+
+    The forward pass is one linear scan per match. Only the lookahead past the
+    end of a match, while the DFA is still alive, is read again by the next
+    search. The backward pass only reads the match and the text before it that
+    the reversed DFA survives.
+
+    Before a pass, the literals that every match must contain or end with are
+    searched with str.find. If the text has none of them left, the search stops
+    at once. Otherwise the next match ends at or after the end of the nearest
+    hit, so the text between the search position and that point must hold a
+    prefix of the match: a lazy DFA of the reversed prefixes of the language
+    runs back from the hit, and the forward pass starts where it died. When
+    every match starts with a known prefix, the forward pass also skips to the
+    next occurrence of one. Either way the forward automaton never reads the
+    text that cannot start a match.
+
+    Args:
+        regex (str): The regular expression.
+        max_states (int, optional): The forward states cached before the cache is flushed. Defaults to 10000.
+
+    Raises:
+        RegexSyntaxError: If the regular expression is not valid.
+
+    Attributes:
+        nfa (CompactNFA): The NFA of the regular expression.
+        reverse (LazyDFA): The lazy DFA of the reversed regular expression.
+        reverse_prefixes (LazyDFA): The lazy DFA of the reversed prefixes of the regular expression.
+        literals (Literals): The literals required by the regular expression.
+    """
+
+    def __init__(self, regex: str, max_states: int = 10000):
+        parser = Parser(regex)
+        tree = parser.parse()
+
+        self.nfa: CompactNFA = Thompson(parser.alpha).subset_construction(tree.root)
+        reverse = Thompson(parser.alpha).subset_construction(tree.reverse().root)
+        self.reverse = LazyDFA(reverse)
+        self.reverse_prefixes = LazyDFA(reverse.suffixes())
+        self.max_states = max_states
+        self.literals = Literals.from_tree(tree)
+
+        atoms = partition(self.nfa.symbols)
+        self._n_atoms = len(atoms)
+        self._covers = [
+            frozenset(a for a, atom in enumerate(atoms) if symbol.contains(atom.first))
+            for symbol in self.nfa.symbols
+        ]
+        self._classes = ClassMap(
+            sorted(
+                (lo, hi, a) for a, atom in enumerate(atoms) for lo, hi in atom.ranges
+            ),
+            len(atoms),
+        )
+
+        self._start = self.nfa.closure(1 << self.nfa.i_state)
+        self.flush()
+
+    def flush(self):
+        """
+        Drops every cached forward state.
+        """
+        self._ids: dict[tuple[tuple[int, ...], bool], int] = {}
+        self._keys: list[tuple[tuple[int, ...], bool]] = []
+        self._rows: list[dict[int, int]] = []
+        self._accepts: list[bool] = []
+
+    def _state(self, groups: list[int], matched: bool) -> int:
+        """
+        Returns the id of a forward state, adding it to the cache if needed.
+
+        The first group containing a final state ends the state: the groups that
+        started later can only give matches further to the right. Until a group
+        matches, a group for a thread starting at the next position is added.
+
+        Args:
+            groups (list[int]): The NFA state sets of the threads, earliest start first.
+            matched (bool): Whether a match was already seen.
+
+        Returns:
+            int: The id of the state, or DEAD if there are no threads left.
+        """
+        accepts = False
+        for i, group in enumerate(groups):
+            if group & self.nfa.f_mask:
+                del groups[i + 1 :]
+                accepts = matched = True
+                break
+
+        if not groups:
+            return DEAD
+
+        key = (tuple(groups), matched)
+        state = self._ids.get(key)
+
+        if state is None:
+            state = self._ids[key] = len(self._keys)
+            self._keys.append(key)
+            self._rows.append({})
+            self._accepts.append(accepts)
+
+        return state
+
+    def _step(self, state: int, atom: int) -> int:
+        """
+        Computes and caches the destiny of a forward state on an atom.
+
+        Args:
+            state (int): The id of the origin state.
+            atom (int): The index of the atom, or the number of atoms for other characters.
+
+        Returns:
+            int: The id of the destiny state, or DEAD.
+        """
+        nfa = self.nfa
+        groups, matched = self._keys[state]
+        following = []
+        seen = 0
+
+        if atom < self._n_atoms:
+            for group in groups:
+                target = 0
+                for s in iter_bits(group):
+                    for k in range(nfa.sym_index[s], nfa.sym_index[s + 1]):
+                        if atom in self._covers[nfa.sym_labels[k]]:
+                            target |= 1 << nfa.sym_targets[k]
+
+                # A state already reached by an earlier thread keeps that thread.
+                target = nfa.closure(target) & ~seen
+                if target:
+                    following.append(target)
+                    seen |= target
+
+        if not matched and self._start & ~seen:
+            following.append(self._start & ~seen)
+
+        destiny = self._state(following, matched)
+        self._rows[state][atom] = destiny
+        return destiny
+
+    def _end(self, codes, pos: int) -> int:
+        """
+        Runs the forward pass from a position.
+
+        Args:
+            codes (bytes | list[int]): The atom of every character of the text.
+            pos (int): The position where the pass starts.
+
+        Returns:
+            int: The end of the leftmost-longest match, or -1 if there is none.
+        """
+        state = self._state([self._start], False)
+        end = pos if self._accepts[state] else -1
+
+        for i in range(pos, len(codes)):
+            destiny = self._rows[state].get(codes[i])
+
+            if destiny is None:
+                if len(self._keys) > self.max_states:
+                    groups, matched = self._keys[state]
+                    self.flush()
+                    state = self._state(list(groups), matched)
+
+                destiny = self._step(state, codes[i])
+
+            if destiny == DEAD:
+                break
+
+            state = destiny
+            if self._accepts[state]:
+                end = i + 1
+
+        return end
+
+    def finditer(self, text: str, pos: int = 0):
+        """
+        Finds every non-overlapping leftmost-longest match in a text.
+
+        After an empty match the search goes on from the next character.
+
+        Args:
+            text (str): The text to search.
+            pos (int, optional): The position where the search starts. Defaults to 0.
+
+        Returns:
+            Iterator[tuple[int, int]]: The span of every match, from left to right.
+        """
+        translated = text.translate(self._classes)
+        if self._n_atoms < 256:
+            codes = translated.encode("latin-1")
+        else:
+            codes = [ord(c) for c in translated]
+
+        prefixes = self.literals.prefixes
+        anchors = [
+            (literals, min(map(len, literals)))
+            for literals in (self.literals.required, self.literals.suffixes)
+            if literals
+        ]
+        found: dict[str, int] = {}
+
+        while pos <= len(text):
+            # The next match holds a hit of every set, so it ends at or after
+            # the farthest end of the nearest hits.
+            anchor = pos
+            for literals, shortest in anchors:
+                hit = Literals.find(text, literals, pos, found)
+                if hit < 0:
+                    return
+                anchor = max(anchor, hit + shortest)
+
+            if anchor > pos:
+                span = self.reverse_prefixes.match(text[pos:anchor][::-1])
+                pos = anchor - span[1] if span else anchor
+
+            if prefixes:
+                pos = Literals.find(text, prefixes, pos, found)
+                if pos < 0:
+                    return
+
+            end = self._end(codes, pos)
+            if end < 0:
+                return
+
+            length = self.reverse.match(text[pos:end][::-1])[1]
+            yield end - length, end
+
+            pos = end if length else end + 1
+
+    def search(self, text: str, pos: int = 0) -> tuple[int, int] | None:
+        """
+        Finds the leftmost-longest match in a text.
+
+        Args:
+            text (str): The text to search.
+            pos (int, optional): The position where the search starts. Defaults to 0.
+
+        Returns:
+            tuple[int, int] | None: The span of the match, or None if there is none.
+        """
+        return next(self.finditer(text, pos), None)
@@ -0,0 +1,190 @@
+from models.compact_nfa import CompactNFA
+from models.compiled_dfa import CompiledDFA
+
+
+class StreamMatcher:
+    """
+    Represents a resumable matcher over a stream that arrives in chunks.
+
+    The matcher keeps, for every active automaton state, the earliest stream
+    offset where a match reaching that state started. A new match is started
+    at every offset. Whenever a final state becomes active, the matcher reports
+    the match ending there that starts the earliest. Matches may overlap, and
+    empty matches are not reported. The active states are bounded by the
+    states of the automaton, so memory does not grow with the stream.
+
+    Chunks may be str, or bytes-like objects whose bytes are read as the code
+    points 0-255 (latin-1). Offsets count characters from the start of the stream.
+
+    Args:
+        automaton (CompiledDFA | CompactNFA): The automaton to run.
+
+    Attributes:
+        offset (int): The number of characters consumed so far.
+        finished (bool): Whether finish was called.
+    """
+
+    def __init__(self, automaton: CompiledDFA | CompactNFA):
+        self.automaton = automaton
+
+        if isinstance(automaton, CompactNFA):
+            self._seeds = list(automaton.state_closure(automaton.i_state))
+            self._finals = set(automaton.f_states)
+        else:
+            self._seeds = [0]
+            self._finals = {s for s, f in enumerate(automaton.accepts) if f}
+
+        self.offset = 0
+        self.finished = False
+        self._threads = dict.fromkeys(self._seeds, 0)
+
+    def _decode(self, chunk: str | bytes | bytearray | memoryview) -> str:
+        """
+        Converts a chunk to text.
+
+        Args:
+            chunk (str | bytes | bytearray | memoryview): The chunk.
+
+        Returns:
+            str: The chunk as text; bytes are decoded as latin-1.
+        """
+        if isinstance(chunk, str):
+            return chunk
+        return str(chunk, "latin-1")
+
+    def _step_dfa(self, text: str) -> list[tuple[int, int]]:
+        """
+        Advances the DFA threads over a text.
+
+        Args:
+            text (str): The text.
+
+        Returns:
+            list[tuple[int, int]]: The matches that end in the text.
+        """
+        dfa = self.automaton
+        next_state, n_classes, dead = dfa.next_state, dfa.n_classes, dfa.dead
+        finals = self._finals
+        threads = self._threads
+        pos = self.offset
+        found = []
+
+        for c in dfa.translate(text):
+            following = {}
+            for s, start in threads.items():
+                d = next_state[s * n_classes + c]
+                if d != dead and d not in following:
+                    following[d] = start
+
+            pos += 1
+            for s, start in following.items():
+                if s in finals:
+                    found.append((start, pos))
+                    break
+
+            following.setdefault(0, pos)
+            threads = following
+
+        self._threads = threads
+        return found
+
+    def _step_nfa(self, text: str) -> list[tuple[int, int]]:
+        """
+        Advances the NFA threads over a text.
+
+        Args:
+            text (str): The text.
+
+        Returns:
+            list[tuple[int, int]]: The matches that end in the text.
+        """
+        nfa = self.automaton
+        symbols, state_closure = nfa.symbols, nfa.state_closure
+        sym_index, sym_labels, sym_targets = (
+            nfa.sym_index,
+            nfa.sym_labels,
+            nfa.sym_targets,
+        )
+        finals, seeds = self._finals, self._seeds
+        threads = self._threads
+        pos = self.offset
+        found = []
+
+        for char in text:
+            code = ord(char)
+            following = {}
+
+            for s, start in threads.items():
+                for k in range(sym_index[s], sym_index[s + 1]):
+                    if symbols[sym_labels[k]].contains(code):
+                        for t in state_closure(sym_targets[k]):
+                            if t not in following:
+                                following[t] = start
+
+            pos += 1
+            for s, start in following.items():
+                if s in finals:
+                    found.append((start, pos))
+                    break
+
+            for s in seeds:
+                following.setdefault(s, pos)
+            threads = following
+
+        self._threads = threads
+        return found
+
+    def feed(
+        self, chunk: str | bytes | bytearray | memoryview
+    ) -> list[tuple[int, int]]:
+        """
+        Consumes a chunk of the stream.
+
+        Args:
+            chunk (str | bytes | bytearray | memoryview): The next chunk.
+
+        Raises:
+            ValueError: If the stream is already finished.
+
+        Returns:
+            list[tuple[int, int]]: The spans of the matches that end in the chunk,
+            as offsets in the whole stream.
+        """
+        if self.finished:
+            raise ValueError("The stream is already finished")
+
+        text = self._decode(chunk)
+
+        if isinstance(self.automaton, CompactNFA):
+            found = self._step_nfa(text)
+        else:
+            found = self._step_dfa(text)
+
+        self.offset += len(text)
+        return found
+
+    def scan(self, file, chunk_size: int = 1 << 16):
+        """
+        Consumes a file-like object chunk by chunk and yields the matches.
+
+        Args:
+            file: An object whose read(size) method returns str or bytes chunks.
+            chunk_size (int, optional): The size of the chunks. Defaults to 64 KiB.
+
+        Returns:
+            Iterator[tuple[int, int]]: The spans of the matches, as offsets in the stream.
+        """
+        while chunk := file.read(chunk_size):
+            yield from self.feed(chunk)
+
+    def finish(self) -> bool:
+        """
+        Ends the stream.
+
+        Returns:
+            bool: True if the automaton accepts the whole stream, False otherwise.
+        """
+        self.finished = True
+        return any(
+            start == 0 and s in self._finals for s, start in self._threads.items()
+        )
@@ -1,5 +1,5 @@
 from models.node import Node
-from utilities.symbol import Symbol
+from utilities.symbol import CONCAT
 
 
 class Tree:
@@ -10,19 +10,19 @@ class Tree:
         _root (Node): The root node of the tree.
 
     Methods:
-        __init__(self, stack: list[Symbol]): Initializes a Tree object.
-        gen_tree(self, stack: list[Symbol]) -> Node: Generates the tree structure from a stack of symbols.
+        __init__(self, root: Node): Initializes a Tree object.
+        reverse(self) -> Tree: Creates the tree of the reversed regular expression.
         show_tree(self, node: Node): Prints the tree structure in post-order traversal.
     """
 
-    def __init__(self, stack: list[Symbol]):
+    def __init__(self, root: Node):
         """
         Initializes a Tree object.
 
         Args:
-            stack (list[Symbol]): A stack of symbols representing a regular expression.
+            root (Node): The root node of the tree.
         """
-        self._root: Node = self.gen_tree(stack)
+        self._root: Node = root
 
     @property
     def root(self) -> Node:
@@ -34,30 +34,45 @@ class Tree:
         """
         return self._root
 
-    def gen_tree(self, stack: list[Symbol]) -> Node:
+    def reverse(self):
         """
-        Generates the tree structure from a stack of symbols.
+        Creates the tree of the reversed regular expression.
 
-        Args:
-            stack (list[Symbol]): A stack of symbols representing a regular expression.
+        The reversed tree matches the reversed strings: the operands of every
+        concatenation are swapped. The tree is copied in post-order with an
+        explicit stack, so deep trees do not hit the recursion limit.
 
         Returns:
-            Node: The root node of the generated tree.
+            Tree: The reversed tree. The original tree is not modified.
         """
-        nodes: list[Node] = []
+        copies: list[Node] = []
+        pending: list[tuple[Node, bool]] = [(self._root, False)]
+
+        while pending:
+            node, expanded = pending.pop()
+
+            if node.is_leaf():
+                copies.append(Node(node.symbol))
+
+            elif expanded:
+                if not node.right:
+                    copies.append(Node(node.symbol, copies.pop()))
+                    continue
+
+                right = copies.pop()
+                left = copies.pop()
+
+                if node.symbol is CONCAT:
+                    left, right = right, left
+                copies.append(Node(node.symbol, left, right))
 
-        for v in stack:
-            if not v.is_operator():
-                nodes.append(Node(v))
             else:
-                if v.value in ["+", "*", "?"]:
-                    nodes.append(Node(v, nodes.pop()))
-                else:
-                    right = nodes.pop()
-                    left = nodes.pop()
-                    nodes.append(Node(v, left, right))
-
-        return nodes.pop()
+                pending.append((node, True))
+                if node.right:
+                    pending.append((node.right, False))
+                pending.append((node.left, False))
+
+        return Tree(copies.pop())
 
     def show_tree(self, node: Node):
         """
@@ -0,0 +1,30 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from interfaces.automata_service import AutomataService
+
+
+def test_timer_of_a_full_batch_does_not_flush_the_next_one():
+    async def run():
+        service = AutomataService(
+            ThreadPoolExecutor(1), batch_delay=0.3, max_batch=4
+        )
+        pattern = await service.compile("(a|b)*abb")
+
+        full = [asyncio.create_task(service.match(pattern, "abb")) for _ in range(4)]
+        await asyncio.sleep(0.1)
+        assert all(task.done() for task in full)
+        assert service.batches == 1
+
+        # The timer of the full batch was due at 0.3; the next batch waits until 0.4.
+        late = [asyncio.create_task(service.match(pattern, "ab")) for _ in range(2)]
+        await asyncio.sleep(0.25)
+        assert not any(task.done() for task in late)
+        assert service.batches == 1
+
+        assert await asyncio.gather(*late) == [False, False]
+        assert service.batches == 2
+        assert service.batched == 6
+        assert service.largest_batch == 4
+
+    asyncio.run(run())
@@ -0,0 +1,13 @@
+import pytest
+
+from utilities.parser import Parser, RegexSyntaxError
+
+
+@pytest.mark.parametrize("regex", [r"[\d-z]", r"[a-\w]", r"[\s-\s]"])
+def test_class_escape_is_not_a_range_endpoint(regex):
+    with pytest.raises(RegexSyntaxError) as error:
+        Parser(regex).parse()
+
+    assert error.value.message == "Invalid class range"
+    assert error.value.position == 1
+    assert isinstance(Parser(regex).validate(), RegexSyntaxError)
@@ -0,0 +1,43 @@
+from utilities.symbol import CharSet, Symbol
+
+
+def compress(
+    alpha: dict[int, Symbol], table: list[dict[int, int]]
+) -> tuple[dict[int, Symbol], list[dict[int, int]]]:
+    """
+    Merges the alphabet keys that have identical transitions in every state.
+
+    The characters of merged keys are equivalent everywhere in the automaton,
+    so they become one CharSet class and one column of the table. Keys with no
+    transition in any state are dropped, since they only lead to the dead state.
+
+    Args:
+        alpha (dict[int, Symbol]): The alphabet of the automaton.
+        table (list[dict[int, int]]): For every state, the destiny of each alphabet key.
+
+    Returns:
+        tuple[dict[int, Symbol], list[dict[int, int]]]: The alphabet of classes
+        and the transition table over it.
+    """
+    groups: dict[tuple[int, ...], list[Symbol]] = {}
+
+    for key, symbol in alpha.items():
+        column = tuple(row.get(key, -1) for row in table)
+        if any(destiny >= 0 for destiny in column):
+            groups.setdefault(column, []).append(symbol)
+
+    classes: dict[int, Symbol] = {}
+    rows: list[dict[int, int]] = [{} for _ in table]
+
+    for column, symbols in groups.items():
+        if len(symbols) == 1:
+            symbol = symbols[0]
+        else:
+            symbol = CharSet([r for s in symbols for r in s.ranges])
+
+        classes[symbol.ord] = symbol
+        for row, destiny in zip(rows, column):
+            if destiny >= 0:
+                row[symbol.ord] = destiny
+
+    return classes, rows
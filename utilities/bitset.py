@@ -0,0 +1,45 @@
+def iter_bits(mask: int):
+    """
+    Iterates over the positions of the set bits of an integer bitset.
+
+    The bitset is converted once to a binary string, reversed so the lowest bit
+    comes first, and its set bits are found with str.find, so the cost is
+    linear in the width of the bitset instead of in its width times its bits.
+
+    Args:
+        mask (int): The bitset.
+
+    Returns:
+        Iterator[int]: The positions of the set bits, from the lowest to the highest.
+    """
+    bits = bin(mask)[:1:-1]
+    i = bits.find("1")
+
+    while i >= 0:
+        yield i
+        i = bits.find("1", i + 1)
+
+
+def from_bits(positions) -> int:
+    """
+    Builds an integer bitset from the positions of its set bits.
+
+    The bits are set in a byte buffer that is converted once, so the cost is
+    linear in the number of positions plus the width of the bitset, instead of
+    copying a growing integer for every position.
+
+    Args:
+        positions (Iterable[int]): The positions of the set bits.
+
+    Returns:
+        int: The bitset.
+    """
+    positions = list(positions)
+    if not positions:
+        return 0
+
+    buffer = bytearray(max(positions) // 8 + 1)
+    for p in positions:
+        buffer[p >> 3] |= 1 << (p & 7)
+
+    return int.from_bytes(buffer, "little")
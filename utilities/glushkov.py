@@ -0,0 +1,224 @@
+from array import array
+
+from models.compact_nfa import CompactNFA
+from models.dfa import DFA
+from models.node import Node
+from utilities.symbol import EPSILON, PLUS, STAR, UNION, Symbol, partition
+
+
+class Glushkov:
+    """
+    Represents a Glushkov (position automaton) construction for regular expressions.
+
+    Every non-epsilon leaf of the tree is a position. The construction fills the
+    position, first_pos, last_pos and null fields of the nodes, computes the
+    followpos sets and builds from them an epsilon-free NFA and a DFA, without
+    going through Thompson's epsilon transitions and their closures.
+
+    Attributes:
+        alpha (dict[int, Symbol]): The alphabet of the regular expressions.
+        symbols (list[Symbol]): The symbol of every position. Position 0 is the initial state.
+        follow (list[set[int]]): The followpos set of every position.
+        root (Node | None): The root node of the last processed tree, if any.
+
+    Methods:
+        positions(node: Node):
+            Computes the positions and followpos sets of a tree.
+
+        subset_construction(node: Node) -> CompactNFA:
+            Builds the position automaton of a regular expression node.
+
+        dfa(node: Node | None = None) -> DFA:
+            Builds the DFA of a tree directly from the followpos sets.
+    """
+
+    def __init__(self, alpha: dict[int, Symbol]) -> None:
+        """
+        Initializes a Glushkov object.
+
+        Args: alpha (dict[int, Symbol]): The alphabet of the regular expressions.
+        """
+        self.alpha = alpha
+        self.symbols: list[Symbol] = [EPSILON]
+        self.follow: list[set[int]] = [set()]
+        self.root: Node | None = None
+
+    def positions(self, node: Node):
+        """
+        Computes the positions and followpos sets of a tree.
+
+        The tree is walked in post-order with an explicit stack. Child sets are
+        shared with the parent whenever the parent's set is the same. The
+        positions of a previously processed tree are discarded.
+
+        Args: node (Node): The root node of the regular expression.
+        """
+        self.root = node
+        self.symbols = [EPSILON]
+        self.follow = [set()]
+        pending: list[tuple[Node, bool]] = [(node, False)]
+
+        while pending:
+            node, expanded = pending.pop()
+
+            if node.is_leaf():
+                if node.symbol is EPSILON:
+                    node.null = True
+                    node.first_pos = node.last_pos = set()
+                    continue
+
+                node.position = len(self.symbols)
+                self.symbols.append(node.symbol)
+                self.follow.append(set())
+                node.first_pos, node.last_pos = {node.position}, {node.position}
+
+            elif not expanded:
+                pending.append((node, True))
+                if node.right:
+                    pending.append((node.right, False))
+                pending.append((node.left, False))
+
+            elif not node.right:
+                child = node.left
+                node.null = child.null or node.symbol is not PLUS
+                node.first_pos, node.last_pos = child.first_pos, child.last_pos
+
+                if node.symbol is STAR or node.symbol is PLUS:
+                    for p in child.last_pos:
+                        self.follow[p].update(child.first_pos)
+
+            elif node.symbol is UNION:
+                left, right = node.left, node.right
+                node.null = left.null or right.null
+                node.first_pos = left.first_pos | right.first_pos
+                node.last_pos = left.last_pos | right.last_pos
+
+            else:
+                left, right = node.left, node.right
+                node.null = left.null and right.null
+                node.first_pos = left.first_pos
+                node.last_pos = right.last_pos
+
+                if left.null:
+                    node.first_pos = left.first_pos | right.first_pos
+                if right.null:
+                    node.last_pos = left.last_pos | right.last_pos
+
+                for p in left.last_pos:
+                    self.follow[p].update(right.first_pos)
+
+    def _finals(self) -> set[int]:
+        """
+        Returns the final positions of the last processed tree.
+
+        Returns: set[int]: The last positions, plus the initial state if the tree is nullable.
+        """
+        finals = set(self.root.last_pos)
+        if self.root.null:
+            finals.add(0)
+        return finals
+
+    def subset_construction(self, node: Node) -> CompactNFA:
+        """
+        Builds the position automaton of a regular expression node.
+
+        The states are the positions plus the initial state 0. Reading the symbol
+        of a position always leads to that position, so there are no epsilon edges.
+
+        Args: node (Node): The root node of the regular expression.
+        Returns: CompactNFA: The epsilon-free NFA.
+        """
+        self.positions(node)
+
+        labels: dict[Symbol, int] = {}
+        symbols: list[Symbol] = []
+        sym_edges = (array("i"), array("i"), array("i"))
+
+        for p, follow in enumerate([node.first_pos, *self.follow[1:]]):
+            for q in sorted(follow):
+                symbol = self.symbols[q]
+                label = labels.get(symbol)
+                if label is None:
+                    label = labels[symbol] = len(symbols)
+                    symbols.append(symbol)
+
+                sym_edges[0].append(p)
+                sym_edges[1].append(label)
+                sym_edges[2].append(q)
+
+        return CompactNFA(
+            self.alpha,
+            symbols,
+            len(self.symbols),
+            0,
+            sorted(self._finals()),
+            (array("i"), array("i")),
+            sym_edges,
+        )
+
+    def dfa(self, node: Node | None = None) -> DFA:
+        """
+        Builds the DFA of a tree directly from the followpos sets.
+
+        A DFA state is the set of positions that may have been read last. Since
+        the position automaton has no epsilon edges, no closure is computed.
+
+        Args:
+            node (Node, optional): The root node of the regular expression. Defaults
+            to the tree processed by the last subset_construction.
+
+        Raises:
+            ValueError: If no node is given and no tree was processed yet.
+
+        Returns: DFA: The (not minimized) DFA.
+        """
+        if node is not None and node is not self.root:
+            self.positions(node)
+
+        if self.root is None:
+            raise ValueError(
+                "No tree to build the DFA from: pass its root node or call subset_construction first"
+            )
+
+        atoms = partition(self.alpha.values())
+        follow = [self.root.first_pos, *self.follow[1:]]
+        finals = self._finals()
+
+        covers = [
+            [a for a, atom in enumerate(atoms) if symbol.contains(atom.first)]
+            for symbol in self.symbols
+        ]
+        covers[0] = []
+
+        # The positions reachable from each position, grouped by atom.
+        moves: list[dict[int, list[int]]] = []
+        for p in range(len(self.symbols)):
+            by_atom: dict[int, list[int]] = {}
+            for q in follow[p]:
+                for a in covers[q]:
+                    by_atom.setdefault(a, []).append(q)
+            moves.append(by_atom)
+
+        start = frozenset([0])
+        ids = {start: 0}
+        subsets = [start]
+        table: list[dict[int, int]] = []
+
+        for subset in subsets:
+            targets: dict[int, set[int]] = {}
+            for p in subset:
+                for a, qs in moves[p].items():
+                    targets.setdefault(a, set()).update(qs)
+
+            row = {}
+            for a, target in targets.items():
+                target = frozenset(target)
+                if target not in ids:
+                    ids[target] = len(subsets)
+                    subsets.append(target)
+                row[atoms[a].ord] = ids[target]
+
+            table.append(row)
+
+        alpha = {atom.ord: atom for atom in atoms}
+        return DFA.from_table(alpha, table, [not finals.isdisjoint(s) for s in subsets])
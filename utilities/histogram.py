@@ -0,0 +1,71 @@
+class LatencyHistogram:
+    """
+    Represents a histogram of latencies with logarithmic buckets.
+
+    Bucket k counts the latencies below 2^k microseconds that did not fit in
+    bucket k - 1, so a few dozen buckets cover from microseconds to hours with
+    a relative error of at most 2x.
+
+    Attributes:
+        count (int): The number of recorded latencies.
+        total (float): The sum of the recorded latencies, in seconds.
+        max (float): The largest recorded latency, in seconds.
+    """
+
+    def __init__(self):
+        self.buckets: list[int] = []
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float):
+        """
+        Records a latency.
+
+        Args:
+            seconds (float): The latency, in seconds.
+        """
+        k = int(seconds * 1e6).bit_length()
+        if k >= len(self.buckets):
+            self.buckets.extend([0] * (k + 1 - len(self.buckets)))
+
+        self.buckets[k] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimates a quantile as the upper bound of the bucket that holds it.
+
+        Args:
+            q (float): The quantile, between 0 and 1.
+
+        Returns:
+            float: The estimated latency, in seconds, or 0 if nothing was recorded.
+        """
+        rank = q * self.count
+        seen = 0
+
+        for k, n in enumerate(self.buckets):
+            seen += n
+            if n and seen >= rank:
+                return min((1 << k) / 1e6, self.max)
+
+        return 0.0
+
+    def json(self) -> dict:
+        """
+        Converts the histogram to a JSON object.
+
+        Returns:
+            dict: The counts by bucket upper bound in microseconds, and a summary.
+        """
+        return {
+            "count": self.count,
+            "mean_us": self.total / self.count * 1e6 if self.count else 0.0,
+            "max_us": self.max * 1e6,
+            "p50_us": self.quantile(0.5) * 1e6,
+            "p99_us": self.quantile(0.99) * 1e6,
+            "buckets_us": {str(1 << k): n for k, n in enumerate(self.buckets) if n},
+        }
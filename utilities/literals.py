@@ -0,0 +1,263 @@
+from models.node import Node
+from models.tree import Tree
+from utilities.symbol import EPSILON, OPTIONAL, PLUS, STAR, UNION
+
+# The most strings kept in a literal set, the most characters a class can
+# hold to be expanded into one, and the longest string kept in a set.
+LIMIT = 16
+CLASS_LIMIT = 8
+MAX_LENGTH = 64
+
+TRIVIAL: frozenset[str] = frozenset([""])
+
+
+def _cross(a: frozenset[str], b: frozenset[str]) -> frozenset[str] | None:
+    """
+    Concatenates every string of a set with every string of another.
+
+    Args:
+        a (frozenset[str]): The first strings.
+        b (frozenset[str]): The second strings.
+
+    Returns:
+        frozenset[str] | None: The concatenations, or None if there would be too many.
+    """
+    if len(a) * len(b) > LIMIT:
+        return None
+    return frozenset(x + y for x in a for y in b)
+
+
+def _heads(strings: frozenset[str]) -> frozenset[str]:
+    """
+    Cuts the strings of a set to their first MAX_LENGTH characters.
+
+    Args:
+        strings (frozenset[str]): The strings.
+
+    Returns:
+        frozenset[str]: The cut strings.
+    """
+    return frozenset(x[:MAX_LENGTH] for x in strings)
+
+
+def _tails(strings: frozenset[str]) -> frozenset[str]:
+    """
+    Cuts the strings of a set to their last MAX_LENGTH characters.
+
+    Args:
+        strings (frozenset[str]): The strings.
+
+    Returns:
+        frozenset[str]: The cut strings.
+    """
+    return frozenset(x[-MAX_LENGTH:] for x in strings)
+
+
+def _union(a: frozenset[str], b: frozenset[str]) -> frozenset[str]:
+    """
+    Joins two literal sets, giving up if the result is too large.
+
+    Args:
+        a (frozenset[str]): The first strings.
+        b (frozenset[str]): The second strings.
+
+    Returns:
+        frozenset[str]: The union, or the trivial set if it is too large.
+    """
+    joined = a | b
+    return joined if len(joined) <= LIMIT else TRIVIAL
+
+
+def _best(*sets: frozenset[str] | None) -> frozenset[str]:
+    """
+    Picks the most selective literal set.
+
+    A set is as selective as its shortest string, and between equally long
+    sets the one with fewer strings is preferred.
+
+    Args:
+        *sets (frozenset[str] | None): The candidate sets. None is skipped.
+
+    Returns:
+        frozenset[str]: The best set.
+    """
+    candidates = [s for s in sets if s]
+    return max(candidates, key=lambda s: (min(map(len, s)), -len(s)), default=TRIVIAL)
+
+
+class Literals:
+    """
+    Represents the literal strings that every match of a regular expression must contain.
+
+    The analysis walks the tree and, for every node, computes the finite set of
+    strings it matches (when it is small), and sets of strings such that every
+    match starts with one, ends with one or contains one of them. Classes with
+    a few characters are expanded into small sets, so [ab]c gives {ac, bc}.
+    Strings are kept up to MAX_LENGTH characters: a node whose strings would be
+    longer is no longer exact, and its prefixes and suffixes are cut to their
+    first and last MAX_LENGTH characters, which keeps the analysis linear on
+    long literals.
+
+    A set is only kept if it is useful: an empty set means nothing is known.
+
+    Args:
+        prefixes (frozenset[str]): Every match starts with one of these strings.
+        suffixes (frozenset[str]): Every match ends with one of these strings.
+        required (frozenset[str]): Every match contains one of these strings.
+
+    Methods:
+        from_tree(tree: Tree) -> Literals:
+            Extracts the literals of a regular expression tree.
+
+        find(text: str, literals: frozenset[str], pos: int, cache: dict[str, int]) -> int:
+            Finds the first occurrence of any of the literals.
+    """
+
+    def __init__(
+        self,
+        prefixes: frozenset[str],
+        suffixes: frozenset[str],
+        required: frozenset[str],
+    ):
+        self.prefixes = prefixes if "" not in prefixes else frozenset()
+        self.suffixes = suffixes if "" not in suffixes else frozenset()
+        self.required = required if "" not in required else frozenset()
+
+    @staticmethod
+    def _leaf(node: Node) -> frozenset[str] | None:
+        """
+        Returns the strings matched by a leaf, if they are few.
+
+        Args:
+            node (Node): The leaf.
+
+        Returns:
+            frozenset[str] | None: The strings, or None for large classes.
+        """
+        if node.symbol is EPSILON:
+            return TRIVIAL
+
+        ranges = node.symbol.ranges
+        if sum(hi - lo + 1 for lo, hi in ranges) > CLASS_LIMIT:
+            return None
+
+        return frozenset(chr(c) for lo, hi in ranges for c in range(lo, hi + 1))
+
+    @staticmethod
+    def from_tree(tree: Tree):
+        """
+        Extracts the literals of a regular expression tree.
+
+        The tree is walked in post-order with an explicit stack. Every node gets
+        a tuple (exact, prefixes, suffixes, required), where exact is the set of
+        strings the node matches, or None if it is large or infinite.
+
+        Args:
+            tree (Tree): The tree of the regular expression.
+
+        Returns:
+            Literals: The literals of the expression.
+        """
+        infos: list[tuple] = []
+        pending: list[tuple[Node, bool]] = [(tree.root, False)]
+
+        while pending:
+            node, expanded = pending.pop()
+
+            if not node.is_leaf() and not expanded:
+                pending.append((node, True))
+                if node.right:
+                    pending.append((node.right, False))
+                pending.append((node.left, False))
+                continue
+
+            if node.is_leaf():
+                exact = Literals._leaf(node)
+                prefixes = suffixes = required = TRIVIAL
+
+            elif not node.right:
+                c_exact, c_prefixes, c_suffixes, c_required = infos.pop()
+                exact = None
+                prefixes = suffixes = required = TRIVIAL
+
+                if node.symbol is PLUS:
+                    prefixes, suffixes, required = c_prefixes, c_suffixes, c_required
+                elif node.symbol is OPTIONAL and c_exact is not None:
+                    exact = _union(c_exact, TRIVIAL)
+                elif node.symbol is not STAR:
+                    exact = c_exact
+
+            else:
+                r_exact, r_prefixes, r_suffixes, r_required = infos.pop()
+                l_exact, l_prefixes, l_suffixes, l_required = infos.pop()
+
+                if node.symbol is UNION:
+                    exact = None
+                    if l_exact is not None and r_exact is not None:
+                        exact = l_exact | r_exact
+                        exact = exact if len(exact) <= LIMIT else None
+
+                    prefixes = _union(l_prefixes, r_prefixes)
+                    suffixes = _union(l_suffixes, r_suffixes)
+                    required = _union(l_required, r_required)
+
+                else:
+                    exact = None
+                    if l_exact is not None and r_exact is not None:
+                        exact = _cross(l_exact, r_exact)
+                        if exact and max(map(len, exact)) > MAX_LENGTH:
+                            exact = None
+
+                    prefixes = l_prefixes
+                    if l_exact is not None:
+                        prefixes = _heads(_cross(l_exact, r_prefixes) or l_exact)
+
+                    suffixes = r_suffixes
+                    if r_exact is not None:
+                        suffixes = _tails(_cross(l_suffixes, r_exact) or r_exact)
+
+                    required = _best(
+                        l_required, r_required, _cross(l_suffixes, r_prefixes)
+                    )
+
+            # A node with few strings is its own prefix, suffix and requirement.
+            if exact is not None:
+                prefixes = suffixes = exact
+                required = _best(required, exact)
+
+            infos.append((exact, prefixes, suffixes, required))
+
+        _, prefixes, suffixes, required = infos.pop()
+        return Literals(prefixes, suffixes, _best(required, prefixes, suffixes))
+
+    @staticmethod
+    def find(
+        text: str, literals: frozenset[str], pos: int, cache: dict[str, int]
+    ) -> int:
+        """
+        Finds the first occurrence of any of the literals at or after a position.
+
+        The next occurrence of every literal is remembered in the cache, so
+        repeated calls with increasing positions search each part of the text
+        once per literal.
+
+        Args:
+            text (str): The text to search.
+            literals (frozenset[str]): The literals.
+            pos (int): The position where the search starts.
+            cache (dict[str, int]): The known next occurrence of every literal, -1 if none.
+
+        Returns:
+            int: The position of the first occurrence, or -1 if there is none.
+        """
+        first = -1
+
+        for literal in literals:
+            found = cache.get(literal)
+            if found is None or 0 <= found < pos:
+                found = cache[literal] = text.find(literal, pos)
+
+            if found >= 0 and (first < 0 or found < first):
+                first = found
+
+        return first
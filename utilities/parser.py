@@ -0,0 +1,335 @@
+from models.node import Node
+from models.tree import Tree
+from utilities.symbol import (
+    ANY,
+    CONCAT,
+    DIGIT,
+    EPSILON,
+    OPEN,
+    SPACE,
+    WORD,
+    CharSet,
+    Kind,
+    Symbol,
+)
+
+
+class RegexSyntaxError(ValueError):
+    """
+    Raised when a regular expression cannot be parsed.
+
+    Attributes:
+        message (str): The description of the error.
+        position (int): The index in the regular expression where the error was found.
+        expected (str | None): The token expected at that position, if there is one.
+    """
+
+    def __init__(self, message: str, position: int, expected: str | None = None):
+        super().__init__(f"{message} at position {position}")
+        self.message = message
+        self.position = position
+        self.expected = expected
+
+
+class Parser:
+    """
+    Parses an infix regular expression straight into a syntax tree.
+
+    The expression is tokenized, the implicit concatenations are added and the
+    nodes of the tree are built in a single left to right pass, so the cost of
+    the parse grows linearly with the length of the expression.
+
+    Attributes:
+        regex (str): The infix regular expression to parse.
+        alpha (dict[int, Symbol]): The alphabet collected while parsing.
+        n_groups (int): The number of capture groups, one per '(' in order of appearance.
+
+    Methods:
+        parse() -> Tree: Parses the regular expression into a syntax tree.
+        validate() -> RegexSyntaxError | None: Returns the first syntax error, if any.
+    """
+
+    ESCAPES = {
+        "d": DIGIT,
+        "w": WORD,
+        "s": SPACE,
+        "D": CharSet(CharSet.complement(DIGIT.ranges), "\\D"),
+        "W": CharSet(CharSet.complement(WORD.ranges), "\\W"),
+        "S": CharSet(CharSet.complement(SPACE.ranges), "\\S"),
+        "n": Symbol("\n"),
+        "t": Symbol("\t"),
+        "r": Symbol("\r"),
+        "f": Symbol("\f"),
+        "v": Symbol("\v"),
+    }
+
+    def __init__(self, regex: str):
+        """
+        Initializes an instance of the Parser class.
+
+        Args:
+            regex (str): The infix regular expression to parse.
+        """
+        self._regex = regex
+
+        self.alpha: dict[int, Symbol] = {EPSILON.ord: EPSILON}
+        self.n_groups = 0
+
+    @property
+    def regex(self):
+        return self._regex
+
+    @regex.setter
+    def regex(self, value: str):
+        self._regex = value
+
+    def parse(self) -> Tree:
+        """
+        Parses the regular expression into a syntax tree.
+
+        Besides single characters and the '|', '*', '+', '?' and '()' operators,
+        the grammar accepts the wildcard '.', classes like '[a-z0-9]' or '[^ab]'
+        and the escapes '\\d', '\\w', '\\s' (and their negations), '\\n', '\\t',
+        '\\r', '\\f', '\\v' and '\\' followed by any punctuation character.
+
+        Every pair of parentheses is a capture group, numbered from 1 in the
+        order of the '('. The number of the group is added to the captures of
+        the node built for its contents.
+
+        Raises:
+            RegexSyntaxError: If the regular expression is not well formed.
+
+        Returns:
+            Tree: The syntax tree of the regular expression.
+        """
+        operands: list[Node] = []
+        operators: list[tuple[Symbol, int]] = []
+        groups: list[int] = []
+        self.n_groups = 0
+
+        # True when the last token closed an operand, so the next operand
+        # must be joined to it with an implicit concatenation.
+        after_operand = False
+
+        i = 0
+        while i < len(self.regex):
+            c = self.regex[i]
+            symbol = Symbol(c)
+            kind = symbol.kind
+            position = i
+            i += 1
+
+            if c == ".":
+                symbol, kind = ANY, Kind.LITERAL
+            elif c == "[":
+                symbol, i = self._parse_class(position)
+                kind = Kind.LITERAL
+            elif c == "\\":
+                symbol, i = self._parse_escape(position)
+                kind = Kind.LITERAL
+
+            if kind is Kind.UNARY:
+                if not after_operand:
+                    raise RegexSyntaxError(
+                        f"Nothing to repeat with '{c}'", position, "operand"
+                    )
+
+                operands.append(Node(symbol, operands.pop()))
+
+            elif kind is Kind.BINARY:
+                if not after_operand:
+                    raise RegexSyntaxError(
+                        f"Expected operand before '{c}'", position, "operand"
+                    )
+
+                self._reduce(operands, operators, symbol.prec)
+                operators.append((symbol, position))
+                after_operand = False
+
+            elif kind is Kind.OPEN:
+                if after_operand:
+                    self._reduce(operands, operators, CONCAT.prec)
+                    operators.append((CONCAT, position))
+
+                operators.append((symbol, position))
+                self.n_groups += 1
+                groups.append(self.n_groups)
+                after_operand = False
+
+            elif kind is Kind.CLOSE:
+                if not after_operand:
+                    raise RegexSyntaxError(
+                        "Expected operand before ')'", position, "operand"
+                    )
+
+                self._reduce(operands, operators, 0)
+                if not operators:
+                    raise RegexSyntaxError("Unbalanced ')'", position)
+
+                operators.pop()
+                operands[-1].captures += (groups.pop(),)
+
+            else:
+                if after_operand:
+                    self._reduce(operands, operators, CONCAT.prec)
+                    operators.append((CONCAT, position))
+
+                self.alpha.setdefault(symbol.ord, symbol)
+                operands.append(Node(symbol))
+                after_operand = True
+
+        if not after_operand:
+            raise RegexSyntaxError("Expected operand", len(self.regex), "operand")
+
+        self._reduce(operands, operators, 0)
+        if operators:
+            raise RegexSyntaxError("Missing ')' for '('", operators[-1][1], "')'")
+
+        return Tree(operands.pop())
+
+    def validate(self) -> RegexSyntaxError | None:
+        """
+        Checks the regular expression by parsing it.
+
+        The check runs in time linear in the length of the expression.
+
+        Returns:
+            RegexSyntaxError | None: The first syntax error found, or None if the expression is valid.
+        """
+        try:
+            self.parse()
+        except RegexSyntaxError as e:
+            return e
+
+        return None
+
+    def _parse_escape(self, i: int) -> tuple[Symbol, int]:
+        """
+        Parses the escape sequence that starts at the given backslash.
+
+        Args:
+            i (int): The position of the backslash.
+
+        Raises:
+            RegexSyntaxError: If the escape is missing or unknown.
+
+        Returns:
+            tuple[Symbol, int]: The escaped symbol and the position after the escape.
+        """
+        if i + 1 >= len(self.regex):
+            raise RegexSyntaxError("Expected character after '\\'", i + 1, "character")
+
+        c = self.regex[i + 1]
+        symbol = self.ESCAPES.get(c)
+
+        if symbol is None:
+            if c.isalnum():
+                raise RegexSyntaxError(f"Unknown escape '\\{c}'", i, "escape")
+            symbol = Symbol(c)
+
+        return symbol, i + 2
+
+    def _parse_class(self, i: int) -> tuple[Symbol, int]:
+        """
+        Parses the character class that starts at the given bracket.
+
+        A ']' right after the opening bracket (or after '^') and a '-' at
+        either end of the class are taken literally.
+
+        Args:
+            i (int): The position of the opening bracket.
+
+        Raises:
+            RegexSyntaxError: If the class is not closed or holds an invalid range.
+
+        Returns:
+            tuple[Symbol, int]: The class symbol and the position after the class.
+        """
+        start = i
+        i += 1
+
+        negate = self.regex.startswith("^", i)
+        if negate:
+            i += 1
+
+        ranges: list[tuple[int, int]] = []
+        first = True
+
+        while True:
+            if i >= len(self.regex):
+                raise RegexSyntaxError("Missing ']' for '['", start, "']'")
+
+            if self.regex[i] == "]" and not first:
+                i += 1
+                break
+
+            first = False
+            lo_position = i
+            lo, i = self._parse_class_item(i)
+
+            if self.regex.startswith("-", i) and not self.regex.startswith("-]", i):
+                hi, i = self._parse_class_item(i + 1)
+
+                # Class escapes like \d are sets, never the end of a range.
+                if (
+                    isinstance(lo, CharSet)
+                    or isinstance(hi, CharSet)
+                    or lo.ord > hi.ord
+                ):
+                    raise RegexSyntaxError("Invalid class range", lo_position)
+
+                ranges.append((lo.ord, hi.ord))
+            else:
+                ranges.extend(lo.ranges)
+
+        if negate:
+            ranges = list(CharSet.complement(ranges))
+
+        if not ranges:
+            raise RegexSyntaxError("Empty character class", start)
+
+        return CharSet(ranges), i
+
+    def _parse_class_item(self, i: int) -> tuple[Symbol, int]:
+        """
+        Parses a single character or escape inside a character class.
+
+        Args:
+            i (int): The position of the item.
+
+        Raises:
+            RegexSyntaxError: If the class ends before the item.
+
+        Returns:
+            tuple[Symbol, int]: The item symbol and the position after the item.
+        """
+        if i >= len(self.regex):
+            raise RegexSyntaxError("Missing ']' for '['", i, "']'")
+
+        if self.regex[i] == "\\":
+            return self._parse_escape(i)
+
+        return Symbol(self.regex[i]), i + 1
+
+    def _reduce(
+        self, operands: list[Node], operators: list[tuple[Symbol, int]], pre: int
+    ):
+        """
+        Builds the pending binary nodes whose precedence is at least the given one.
+
+        Stops at the first open parenthesis found on the operator stack.
+        Concatenation binds tighter than alternation, so 'ab|c' is read as '(ab)|c'.
+
+        Args:
+            operands (list[Node]): The stack of built nodes.
+            operators (list[tuple[Symbol, int]]): The stack of pending operators and their positions.
+            pre (int): The minimum precedence to reduce.
+        """
+        while operators and operators[-1][0] is not OPEN:
+            if operators[-1][0].prec < pre:
+                break
+
+            symbol, _ = operators.pop()
+            right = operands.pop()
+            left = operands.pop()
+            operands.append(Node(symbol, left, right))
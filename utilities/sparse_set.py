@@ -0,0 +1,60 @@
+from array import array
+
+
+class SparseSet:
+    """
+    Represents a set of integers in 0..capacity-1 with O(1) add, lookup and clear.
+
+    The members are kept in insertion order in the dense array; sparse maps a
+    member to its slot in dense. Clearing only resets the size, so a set can be
+    reused for every input character without reallocating.
+
+    Args:
+        capacity (int): The exclusive upper bound of the members.
+
+    Attributes:
+        dense (array): The members, in insertion order, in its first size slots.
+        sparse (array): The slot in dense of every member.
+        size (int): The number of members.
+    """
+
+    __slots__ = ("dense", "sparse", "size")
+
+    def __init__(self, capacity: int):
+        self.dense = array("i", [0]) * capacity
+        self.sparse = array("i", [0]) * capacity
+        self.size = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __contains__(self, value: int) -> bool:
+        slot = self.sparse[value]
+        return slot < self.size and self.dense[slot] == value
+
+    def __iter__(self):
+        return iter(self.dense[: self.size])
+
+    def add(self, value: int) -> bool:
+        """
+        Adds a member to the set.
+
+        Args:
+            value (int): The member to add.
+
+        Returns:
+            bool: True if the member was added, False if it was already in the set.
+        """
+        if value in self:
+            return False
+
+        self.dense[self.size] = value
+        self.sparse[value] = self.size
+        self.size += 1
+        return True
+
+    def clear(self):
+        """
+        Removes every member of the set.
+        """
+        self.size = 0
@@ -1,20 +1,114 @@
-import re
+from bisect import bisect_right
+from enum import Enum
+from itertools import count
+from weakref import WeakValueDictionary
+
+
+class Kind(Enum):
+    LITERAL = 1
+    UNARY = 2
+    BINARY = 3
+    OPEN = 4
+    CLOSE = 5
 
 
 class Symbol:
-    def __init__(self, value: str):
+    """
+    Represents a symbol of a regular expression.
+
+    Symbols are interned: creating a Symbol for a code point that was already
+    seen returns the same shared instance, so symbols can be compared by
+    identity. The kind of operator and its precedence are computed once, when
+    the symbol is first created.
+
+    Args:
+        value (str): The value of the symbol.
+
+    Attributes:
+        value (str): The value of the symbol.
+        ord (int): The code point of the symbol.
+        kind (Kind): Whether the symbol is a literal or which kind of operator it is.
+        prec (int): The precedence of the symbol as an operator, -1 if it has none.
+    """
+
+    __slots__ = ("value", "ord", "kind", "prec")
+
+    _registry: dict[int, "Symbol"] = {}
+    _operators = {
+        "*": (Kind.UNARY, 3),
+        "+": (Kind.UNARY, 3),
+        "?": (Kind.UNARY, 3),
+        ".": (Kind.BINARY, 2),
+        "|": (Kind.BINARY, 1),
+        "(": (Kind.OPEN, -1),
+        ")": (Kind.CLOSE, -1),
+    }
+
+    def __new__(cls, value: str):
+        code = ord(value)
+        symbol = cls._registry.get(code)
+
+        if symbol is None:
+            symbol = super().__new__(cls)
+            symbol.value = value
+            symbol.ord = code
+            symbol.kind, symbol.prec = cls._operators.get(value, (Kind.LITERAL, -1))
+            cls._registry[code] = symbol
+
+        return symbol
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return (Symbol, (self.value,))
+
+    @property
+    def ranges(self) -> tuple[tuple[int, int], ...]:
+        """
+        Returns the code point ranges matched by the symbol.
+
+        Returns:
+            tuple[tuple[int, int], ...]: The inclusive (low, high) ranges.
         """
-        Initializes a new Symbol object.
+        return ((self.ord, self.ord),)
+
+    @property
+    def first(self) -> int:
+        """
+        Returns the lowest code point matched by the symbol.
+
+        Returns:
+            int: The lowest code point.
+        """
+        return self.ord
+
+    def contains(self, code: int) -> bool:
+        """
+        Checks if the symbol matches a code point.
 
         Args:
-            value (str): The value of the symbol.
+            code (int): The code point to check.
 
-        Attributes:
-            value (str): The value of the symbol.
-            ord (int): The ASCII value of the symbol.
+        Returns:
+            bool: True if the symbol matches the code point, False otherwise.
         """
-        self.value = value
-        self.ord = ord(value)
+        return code == self.ord
+
+    def display(self) -> str:
+        """
+        Returns the symbol as it is written in a regular expression.
+
+        Metacharacters are escaped, so the literal '.' shows as '\\.' and
+        cannot be mistaken for the wildcard.
+
+        Returns:
+            str: The label of the symbol.
+        """
+        return "\\" + self.value if self.value in METACHARACTERS else self.value
 
     def is_operator(self) -> bool:
         """
@@ -23,7 +117,7 @@ class Symbol:
         Returns:
             bool: True if the symbol is an operator, False otherwise.
         """
-        return bool(re.fullmatch(r"[.()|*+?]", self.value))
+        return self.kind is not Kind.LITERAL
 
     def json(self):
         """
@@ -45,4 +139,226 @@ class Symbol:
         Returns:
             Symbol: The Symbol object created from the JSON object.
         """
+        if "ranges" in data:
+            return CharSet(data["ranges"], data["value"])
+
         return Symbol(data["value"])
+
+
+class CharSet(Symbol):
+    """
+    Represents a set of code point ranges matched as a single symbol.
+
+    Character classes, escapes like \\d and the wildcard are CharSets, so an
+    automaton uses one transition for [a-z] instead of one per character. Sets
+    are interned by their ranges while they are in use: the registry holds
+    weak references, so the sets of automata that are gone are freed. A set
+    holding a single code point is the plain Symbol of that code point.
+
+    Args:
+        ranges (Iterable[tuple[int, int]]): The inclusive (low, high) ranges of the set.
+        value (str, optional): The label of the set. Built from the ranges if omitted.
+
+    Attributes:
+        value (str): The label of the set.
+        ord (int): A negative key, unique to the set, used to index alphabets.
+    """
+
+    __slots__ = ("_ranges", "_lows", "__weakref__")
+
+    MAX = 0x10FFFF
+
+    _sets: WeakValueDictionary[tuple[tuple[int, int], ...], "CharSet"] = (
+        WeakValueDictionary()
+    )
+    # Keys are never reused, so a freed set cannot share one with a live set.
+    _ords = count(-1, -1)
+
+    def __new__(cls, ranges, value: str | None = None):
+        ranges = CharSet.normalize(ranges)
+
+        if len(ranges) == 1 and ranges[0][0] == ranges[0][1]:
+            return Symbol(chr(ranges[0][0]))
+
+        charset = cls._sets.get(ranges)
+
+        if charset is None:
+            charset = object.__new__(cls)
+            charset._ranges = ranges
+            charset._lows = tuple(lo for lo, _ in ranges)
+            charset.value = value or CharSet.label(ranges)
+            charset.ord = next(cls._ords)
+            charset.kind, charset.prec = Kind.LITERAL, -1
+            cls._sets[ranges] = charset
+
+        return charset
+
+    def __reduce__(self):
+        return (CharSet, (self._ranges, self.value))
+
+    @property
+    def ranges(self) -> tuple[tuple[int, int], ...]:
+        return self._ranges
+
+    @property
+    def first(self) -> int:
+        return self._lows[0]
+
+    def contains(self, code: int) -> bool:
+        i = bisect_right(self._lows, code) - 1
+        return i >= 0 and code <= self._ranges[i][1]
+
+    def display(self) -> str:
+        return self.value
+
+    def json(self):
+        return {"value": self.value, "ord": self.ord, "ranges": self._ranges}
+
+    @staticmethod
+    def normalize(ranges) -> tuple[tuple[int, int], ...]:
+        """
+        Sorts the ranges and merges the ones that overlap or touch.
+
+        Args:
+            ranges (Iterable[tuple[int, int]]): The inclusive (low, high) ranges.
+
+        Returns:
+            tuple[tuple[int, int], ...]: The normalized ranges.
+        """
+        merged: list[list[int]] = []
+
+        for lo, hi in sorted(ranges):
+            if merged and lo <= merged[-1][1] + 1:
+                merged[-1][1] = max(merged[-1][1], hi)
+            else:
+                merged.append([lo, hi])
+
+        return tuple((lo, hi) for lo, hi in merged)
+
+    @staticmethod
+    def complement(ranges) -> tuple[tuple[int, int], ...]:
+        """
+        Returns the code point ranges not covered by the given ones.
+
+        Args:
+            ranges (Iterable[tuple[int, int]]): The inclusive (low, high) ranges.
+
+        Returns:
+            tuple[tuple[int, int], ...]: The ranges of the complement.
+        """
+        result = []
+        low = 0
+
+        for lo, hi in CharSet.normalize(ranges):
+            if lo > low:
+                result.append((low, lo - 1))
+            low = hi + 1
+
+        if low <= CharSet.MAX:
+            result.append((low, CharSet.MAX))
+
+        return tuple(result)
+
+    @staticmethod
+    def label(ranges: tuple[tuple[int, int], ...]) -> str:
+        """
+        Builds a readable class label for the given normalized ranges.
+
+        Args:
+            ranges (tuple[tuple[int, int], ...]): The normalized ranges.
+
+        Returns:
+            str: The label, negated when the set covers most of the code points.
+        """
+        size = sum(hi - lo + 1 for lo, hi in ranges)
+        negate = size > CharSet.MAX // 2
+
+        if negate:
+            ranges = CharSet.complement(ranges)
+
+        parts = []
+        for lo, hi in ranges:
+            if lo == hi:
+                parts.append(_escape(lo))
+            elif hi == lo + 1:
+                parts.append(_escape(lo) + _escape(hi))
+            else:
+                parts.append(f"{_escape(lo)}-{_escape(hi)}")
+
+        return f"[{'^' if negate else ''}{''.join(parts)}]"
+
+
+def _escape(code: int) -> str:
+    """
+    Returns a printable form of a code point for class labels.
+
+    Args:
+        code (int): The code point.
+
+    Returns:
+        str: The character, or an escape sequence if it is not printable.
+    """
+    c = chr(code)
+    if c in "\\]^-[":
+        return "\\" + c
+    if c.isprintable() and not c.isspace():
+        return c
+    return {"\n": "\\n", "\t": "\\t", "\r": "\\r", " ": " "}.get(c, f"\\x{{{code:x}}}")
+
+
+def partition(symbols) -> list[Symbol]:
+    """
+    Splits the code points matched by the given symbols into disjoint atoms.
+
+    Two code points fall in the same atom when exactly the same symbols match
+    them, so every symbol is a union of atoms and an automaton built over the
+    atoms is deterministic. The epsilon symbol is ignored. The number of atoms
+    grows with the number of distinct ranges, not with the number of characters.
+
+    Args:
+        symbols (Iterable[Symbol]): The symbols to split.
+
+    Returns:
+        list[Symbol]: The atoms, ordered by their lowest code point.
+    """
+    events: dict[int, list[tuple[int, bool]]] = {}
+    symbols = [s for s in symbols if s is not EPSILON]
+
+    for i, symbol in enumerate(symbols):
+        for lo, hi in symbol.ranges:
+            events.setdefault(lo, []).append((i, True))
+            events.setdefault(hi + 1, []).append((i, False))
+
+    groups: dict[frozenset[int], list[tuple[int, int]]] = {}
+    active: set[int] = set()
+    bounds = sorted(events)
+
+    for lo, hi in zip(bounds, bounds[1:]):
+        for i, opens in events[lo]:
+            if opens:
+                active.add(i)
+            else:
+                active.discard(i)
+
+        if active:
+            groups.setdefault(frozenset(active), []).append((lo, hi - 1))
+
+    atoms = [CharSet(ranges) for ranges in groups.values()]
+    return sorted(atoms, key=lambda a: a.first)
+
+
+METACHARACTERS = ".*+?|()[]\\"
+
+EPSILON = Symbol("ε")
+CONCAT = Symbol(".")
+UNION = Symbol("|")
+STAR = Symbol("*")
+PLUS = Symbol("+")
+OPTIONAL = Symbol("?")
+OPEN = Symbol("(")
+CLOSE = Symbol(")")
+
+ANY = CharSet(CharSet.complement([(10, 10)]), ".")
+DIGIT = CharSet([(48, 57)], "\\d")
+WORD = CharSet([(48, 57), (65, 90), (95, 95), (97, 122)], "\\w")
+SPACE = CharSet([(9, 13), (32, 32)], "\\s")
@@ -1,165 +1,247 @@
-from models.nfa import NFA
+from array import array
+
+from models.compact_nfa import CompactNFA
 from models.node import Node
-from utilities.state import State, Type
-from utilities.symbol import Symbol
-from utilities.transition import Transition
+from utilities.symbol import EPSILON, PLUS, STAR, UNION, Symbol
 
 
 class Thompson:
     """
     Represents a Thompson construction for building NFAs from regular expressions.
 
+    The construction emits a CompactNFA: states are consecutive integers and
+    edges are appended to shared array buffers as the fragments are built.
+
+    The epsilon edges of every state are added in order of preference: loops
+    and optional parts are tried before skipping them, and the left side of a
+    union before the right one. With captures, the fragment of every capture
+    group is wrapped between two new states whose epsilon edges are tagged with
+    the slots 2k and 2k + 1 of group k, which record where the group starts and ends.
+
     Attributes:
         alpha (dict[int, Symbol]): The alphabet of the regular expressions.
+        captures (bool): Whether capture groups are tagged.
+        tags (dict[int, int]): The slot of every tagged state.
         num_states (int): The number of states in the NFA.
         epsilon (Symbol): The epsilon symbol used in the NFA.
+        symbols (list[Symbol]): The labels of the symbol edges, indexed by label id.
 
     Methods:
-        _set_trans(o_state: State, f_state: State) -> Transition:
-            Sets a transition from the origin state to the final state with epsilon symbol.
+        _new_state() -> int:
+            Allocates a new state.
+
+        _set_trans(o_state: int, f_state: int, symbol: Symbol):
+            Adds an edge from the origin state to the final state.
+
+        _combine(node: Node, fragments: list[tuple[int, int]]):
+            Replaces the fragments of the children of a node with the fragment of the node.
+
+        _capture(node: Node, fragments: list[tuple[int, int]]):
+            Wraps the fragment of a node in the tagged states of its capture groups.
 
-        _pos_child(states: list[State], typ: Type, _v=0) -> int:
-            Returns the position of the child state with the specified type.
+        _fragment(node: Node) -> tuple[int, int]:
+            Builds the fragment of a regular expression node.
 
-        subset_construction(node: Node) -> NFA:
+        subset_construction(node: Node) -> CompactNFA:
             Performs the subset construction algorithm to build an NFA from a regular expression node.
+
+        union_construction(nodes: list[Node]) -> CompactNFA:
+            Builds one NFA for several regular expressions, with a final state per expression.
     """
 
-    def __init__(self, alpha: dict[int, Symbol]) -> None:
+    def __init__(self, alpha: dict[int, Symbol], captures: bool = False) -> None:
         """
         Initializes a Thompson object.
 
-        Args: alpha (dict[int, Symbol]): The alphabet of the regular expressions.
+        Args:
+            alpha (dict[int, Symbol]): The alphabet of the regular expressions.
+            captures (bool, optional): Whether to tag capture groups. Defaults to False.
         """
         self.alpha = alpha
+        self.captures = captures
+        self.tags: dict[int, int] = {}
         self.num_states = 0
-        self.epsilon = Symbol("ε")
+        self.epsilon = EPSILON
+        self.symbols: list[Symbol] = []
 
-    def _set_trans(self, o_state: State, f_state: State) -> Transition:
-        """
-        Sets a transition from the origin state to the final state with epsilon symbol.
-
-        Args:
-            o_state (State): The origin state of the transition.
-            f_state (State): The final state of the transition.
+        self._labels: dict[Symbol, int] = {}
+        self._eps = (array("i"), array("i"))
+        self._sym = (array("i"), array("i"), array("i"))
 
-        Returns: Transition: The created transition.
+    def _new_state(self) -> int:
         """
-        return Transition(o_state, self.epsilon, f_state)
+        Allocates a new state.
 
-    def _pos_child(self, states: list[State], typ: Type, _v=0) -> int:
+        Returns: int: The id of the new state.
         """
-        Returns the position of the child state with the specified type.
+        self.num_states += 1
+        return self.num_states - 1
 
-        Args:
-            states (list[State]): The list of states to search in.
-            typ (Type): The type of the child state to find.
-            _v (int, optional): The default position value if the child state is not found. Defaults to 0.
-
-        Returns: int: The position of the child state, or the default position value if not found.
+    def _set_trans(self, o_state: int, f_state: int, symbol: Symbol = EPSILON):
         """
-        return next((i for i, v in enumerate(states) if v.typ == typ), _v)
-
-    def subset_construction(self, node: Node) -> NFA:
-        """
-        Performs the subset construction algorithm to build an NFA from a regular expression node.
+        Adds an edge from the origin state to the final state.
 
-        Args: node (Node): The root node of the regular expression.
-        Returns: NFA: The constructed NFA.
+        Args:
+            o_state (int): The origin state of the edge.
+            f_state (int): The final state of the edge.
+            symbol (Symbol, optional): The symbol of the edge. Defaults to epsilon.
         """
+        if symbol is self.epsilon:
+            self._eps[0].append(o_state)
+            self._eps[1].append(f_state)
+            return
 
-        if node.is_leaf() or node.symbol.value in "*?|":
-            o_new_state = State(self.num_states, 1)
-            f_new_state = State(self.num_states + 1, 3)
-            self.num_states += 2
+        label = self._labels.get(symbol)
+        if label is None:
+            label = self._labels[symbol] = len(self.symbols)
+            self.symbols.append(symbol)
 
-        if node.is_leaf():
-            new_trans = Transition(o_new_state, node.symbol, f_new_state)
-            states = [o_new_state, f_new_state]
-            trans = [new_trans]
+        self._sym[0].append(o_state)
+        self._sym[1].append(label)
+        self._sym[2].append(f_state)
 
-            return NFA(self.alpha, states, o_new_state, f_new_state, trans)
+    def _combine(self, node: Node, fragments: list[tuple[int, int]]):
+        """
+        Replaces the fragments of the children of a node with the fragment of the node.
 
+        Args:
+            node (Node): The operator node, whose children fragments are on top of the stack.
+            fragments (list[tuple[int, int]]): The stack of initial and final states of the fragments.
+        """
         if not node.right:
-            nfa = self.subset_construction(node.left)
-            c_states = nfa.states
-            states = [*c_states]
-            trans = [*nfa.trans]
-
-            i_pos = self._pos_child(c_states, Type.INITIAL)
-            f_pos = self._pos_child(c_states, Type.FINAL, -1)
-
-            if node.symbol.value in "*?":
-                for v in c_states:
-                    if v.typ in [Type.INITIAL, Type.FINAL]:
-                        v.typ = Type.TRANS
-
-                skip = self._set_trans(o_new_state, f_new_state)
-                first = self._set_trans(o_new_state, c_states[i_pos])
-                last = self._set_trans(c_states[f_pos], f_new_state)
-
-                trans.extend([skip, first, last])
-                states = [o_new_state, *c_states, f_new_state]
-
-            if node.symbol.value in "*+":
-                back = Transition(c_states[f_pos], self.epsilon, c_states[i_pos])
-                trans.append(back)
-
-            if node.symbol.value == "+":
-                o_new_state, f_new_state = nfa.i_state, nfa.f_state
-
-            return NFA(self.alpha, states, o_new_state, f_new_state, trans)
-
-        left = self.subset_construction(node.left)
-        right = self.subset_construction(node.right)
-
-        states_left = left.states
-        states_right = right.states
+            o_child, f_child = fragments.pop()
+
+            if node.symbol is STAR or node.symbol is PLUS:
+                self._set_trans(f_child, o_child)
+
+            if node.symbol is PLUS:
+                fragments.append((o_child, f_child))
+                return
+
+            o_state, f_state = self._new_state(), self._new_state()
+            self._set_trans(o_state, o_child)
+            self._set_trans(o_state, f_state)
+            self._set_trans(f_child, f_state)
+            fragments.append((o_state, f_state))
+            return
+
+        o_right, f_right = fragments.pop()
+        o_left, f_left = fragments.pop()
+
+        if node.symbol is UNION:
+            o_state, f_state = self._new_state(), self._new_state()
+            self._set_trans(o_state, o_left)
+            self._set_trans(o_state, o_right)
+            self._set_trans(f_left, f_state)
+            self._set_trans(f_right, f_state)
+            fragments.append((o_state, f_state))
+            return
+
+        self._set_trans(f_left, o_right)
+        fragments.append((o_left, f_right))
+
+    def _capture(self, node: Node, fragments: list[tuple[int, int]]):
+        """
+        Wraps the fragment of a node in the tagged states of its capture groups.
 
-        states = [*states_left, *states_right]
+        Args:
+            node (Node): The node, whose fragment is on top of the stack.
+            fragments (list[tuple[int, int]]): The stack of initial and final states of the fragments.
+        """
+        o_child, f_child = fragments.pop()
 
-        i_pos_r = self._pos_child(states_right, Type.INITIAL)
-        f_pos_l = self._pos_child(states_left, Type.FINAL, -1)
+        for group in node.captures:
+            o_state, f_state = self._new_state(), self._new_state()
+            self.tags[o_state] = 2 * group
+            self.tags[f_state] = 2 * group + 1
+            self._set_trans(o_state, o_child)
+            self._set_trans(f_child, f_state)
+            o_child, f_child = o_state, f_state
 
-        if node.symbol.value == "|":
-            states.insert(0, o_new_state)
-            states.append(f_new_state)
+        fragments.append((o_child, f_child))
 
-            i_pos_l = self._pos_child(states_left, Type.INITIAL)
-            f_pos_r = self._pos_child(states_right, Type.FINAL, -1)
+    def _fragment(self, node: Node) -> tuple[int, int]:
+        """
+        Builds the fragment of a regular expression node.
 
-            for v in states_left:
-                if v.typ in [Type.INITIAL, Type.FINAL]:
-                    v.typ = Type.TRANS
+        The tree is walked in post-order with an explicit stack, so deep trees do
+        not hit the recursion limit and the work is linear in the number of nodes.
 
-            for v in states_right:
-                if v.typ in [Type.INITIAL, Type.FINAL]:
-                    v.typ = Type.TRANS
+        Args: node (Node): The root node of the regular expression.
+        Returns: tuple[int, int]: The initial and final states of the fragment.
+        """
+        fragments: list[tuple[int, int]] = []
+        pending: list[tuple[Node, bool]] = [(node, False)]
 
-            trans = [*left.trans, *right.trans]
+        while pending:
+            node, expanded = pending.pop()
 
-            begin_or_p1 = self._set_trans(o_new_state, states_left[i_pos_l])
-            begin_or_p2 = self._set_trans(o_new_state, states_right[i_pos_r])
+            if node.is_leaf():
+                o_state, f_state = self._new_state(), self._new_state()
+                self._set_trans(o_state, f_state, node.symbol)
+                fragments.append((o_state, f_state))
 
-            end_or_p1 = self._set_trans(states_left[f_pos_l], f_new_state)
-            end_or_p2 = self._set_trans(states_right[f_pos_r], f_new_state)
+            elif expanded:
+                self._combine(node, fragments)
 
-            trans.extend([begin_or_p1, begin_or_p2, end_or_p1, end_or_p2])
+            else:
+                pending.append((node, True))
+                if node.right:
+                    pending.append((node.right, False))
+                pending.append((node.left, False))
+                continue
 
-            return NFA(self.alpha, states, o_new_state, f_new_state, trans)
+            if self.captures and node.captures:
+                self._capture(node, fragments)
 
-        first_state = left.i_state
-        last_state = right.f_state
+        return fragments.pop()
 
-        for v in states_left:
-            if v.typ == Type.FINAL:
-                v.typ = Type.TRANS
+    def subset_construction(self, node: Node) -> CompactNFA:
+        """
+        Performs the subset construction algorithm to build an NFA from a regular expression node.
 
-        for v in states_right:
-            if v.typ == Type.INITIAL:
-                v.typ = Type.TRANS
+        Args: node (Node): The root node of the regular expression.
+        Returns: CompactNFA: The constructed NFA.
+        """
+        i_state, f_state = self._fragment(node)
+
+        return CompactNFA(
+            self.alpha,
+            self.symbols,
+            self.num_states,
+            i_state,
+            f_state,
+            self._eps,
+            self._sym,
+            self.tags,
+        )
+
+    def union_construction(self, nodes: list[Node]) -> CompactNFA:
+        """
+        Builds one NFA for several regular expressions, with a final state per expression.
 
-        dot = self._set_trans(states_left[f_pos_l], states_right[i_pos_r])
-        trans = [*left.trans, *right.trans, dot]
+        A new initial state has an epsilon edge to the fragment of every
+        expression. The fragments keep their own final states, so the i-th final
+        state of the NFA is the one of the i-th expression.
 
-        return NFA(self.alpha, states, first_state, last_state, trans)
+        Args: nodes (list[Node]): The root nodes of the regular expressions.
+        Returns: CompactNFA: The constructed NFA.
+        """
+        i_state = self._new_state()
+        f_states = []
+
+        for node in nodes:
+            o_state, f_state = self._fragment(node)
+            self._set_trans(i_state, o_state)
+            f_states.append(f_state)
+
+        return CompactNFA(
+            self.alpha,
+            self.symbols,
+            self.num_states,
+            i_state,
+            f_states,
+            self._eps,
+            self._sym,
+            self.tags,
+        )
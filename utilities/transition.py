@@ -33,7 +33,7 @@ class Transition:
         if isinstance(__o, Transition):
             return (
                 self.origin.id == __o.origin.id
-                and self.symbol.value == __o.symbol.value
+                and self.symbol is __o.symbol
                 and self.destiny.id == __o.destiny.id
             )
         return False
@@ -41,14 +41,15 @@ class Transition:
     def json(self):
         return {
             "origin": self.origin.id,
-            "symbol": self.symbol.value,
+            "symbol": self.symbol.json(),
             "destiny": self.destiny.id,
         }
 
     @staticmethod
     def from_json(data: dict):
+        symbol = data["symbol"]
         return Transition(
             State(data["origin"], 1),
-            Symbol(data["symbol"]),
+            Symbol.from_json(symbol) if isinstance(symbol, dict) else Symbol(symbol),
             State(data["destiny"], 3),
         )
@@ -1,4 +1,4 @@
-import regex as rx
+from utilities.parser import Parser, RegexSyntaxError
 
 
 def validate_regex(regex: str) -> bool:
@@ -7,5 +7,13 @@ def validate_regex(regex: str) -> bool:
     Args: regex (str): The regular expression to be validated.
     Returns: bool: True if the regular expression is valid, False otherwise.
     """
-    regex_validator = rx.compile(r"(\w+|(\((?R)+\)))[+*?]?[+?]?(\|?(?R))?+")
-    return bool(regex_validator.fullmatch(regex))
+    return regex_error(regex) is None
+
+
+def regex_error(regex: str) -> RegexSyntaxError | None:
+    """
+    Returns the syntax error of a regular expression, if it has one.
+    Args: regex (str): The regular expression to be validated.
+    Returns: RegexSyntaxError | None: The error with its position and expected token, or None.
+    """
+    return Parser(regex).validate()
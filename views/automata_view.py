@@ -1,7 +1,7 @@
 import customtkinter as ctk
 from PIL import Image
 
-from utilities.validate import validate_regex
+from utilities.validate import regex_error
 from views.alert import Alert
 
 
@@ -54,8 +54,9 @@ class AutomataView(ctk.CTkFrame):
 
     def on_return(self, event):
         regex = event.widget.get()
-        if not validate_regex(regex):
-            self.open_toplevel("Invalid regex")
+        error = regex_error(regex)
+        if error:
+            self.open_toplevel(f"Invalid regex: {error}")
         else:
             self.entry_regex = regex
             self.on_automata("NFA")